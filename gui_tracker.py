@@ -14,7 +14,7 @@ import logging
 import traceback
 
 # Import the core tracker
-from tracker import TimeTracker
+from tracker import TimeTracker, AppKey
 from ui.themes import get_theme, DARK_THEME, LIGHT_THEME, get_category_color
 
 # Set appearance
@@ -32,6 +32,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger('TimeTrackerGUI')
 
+# Status colors
+GREEN = "#4caf50"
+ORANGE = "#ff9800"
+RED = "#f44336"
+
 class TimeTrackerGUI(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -50,6 +55,7 @@ class TimeTrackerGUI(ctk.CTk):
             self.is_tracking = False
             self.is_dark_mode = True
             self.last_error = None
+            self._last_dash = {}
 
             # Restore focus mode state from config
             self.tracker.focus_mode = self.tracker.config.get("focus_mode_active", False)
@@ -271,6 +277,10 @@ class TimeTrackerGUI(ctk.CTk):
         self.category_container = ctk.CTkFrame(category_frame, fg_color="transparent")
         self.category_container.pack(fill="both", expand=True, padx=20, pady=(0,20))
 
+        # Fonts reused by every category bar refresh
+        self.category_name_font = ctk.CTkFont(size=13, weight="bold")
+        self.category_hours_font = ctk.CTkFont(size=13)
+
     def init_analytics_tab(self):
         """Initialize analytics tab"""
         # Scrollable frame
@@ -748,6 +758,7 @@ class TimeTrackerGUI(ctk.CTk):
             logger.info("Starting tracking loop")
             self.tracker.is_paused = False
             self.tracker.session_start = datetime.now()
+            self.tracker.start_focus_watcher()
 
             while self.is_tracking:
                 try:
@@ -758,8 +769,10 @@ class TimeTrackerGUI(ctk.CTk):
                         app = self.tracker.get_active_window()
 
                         if app and app != "Unknown":
+                            key = AppKey(app, app.lower())
+
                             # Check focus mode
-                            if self.tracker.is_app_blocked(app):
+                            if self.tracker.focus_mode and self.tracker.is_app_blocked(key):
                                 self.tracker.send_notification(
                                     "🚫 Blocked App",
                                     f"{app[:30]} is blocked in focus mode"
@@ -771,13 +784,14 @@ class TimeTrackerGUI(ctk.CTk):
                             if self.tracker.current_app == app:
                                 elapsed = self.tracker.get_current_elapsed_time()
                                 if elapsed >= 5:
-                                    self.tracker.record_time(app, elapsed, self.tracker.current_project)
+                                    self.tracker.record_time(key, elapsed, self.tracker.current_project)
                                     self.tracker.start_time = self.tracker.get_time()
-                                    self.tracker.save_data()
+                                    self.tracker.flush()
                             else:
                                 if self.tracker.current_app:
                                     elapsed = self.tracker.get_current_elapsed_time()
                                     self.tracker.record_time(self.tracker.current_app, elapsed, self.tracker.current_project)
+                                    self.tracker.flush()
 
                                 self.tracker.current_app = app
                                 self.tracker.start_time = self.tracker.get_time()
@@ -792,8 +806,7 @@ class TimeTrackerGUI(ctk.CTk):
                     logger.error(f"Error in tracking loop iteration: {e}", exc_info=True)
                     self.last_error = str(e)
 
-                import time
-                time.sleep(5)
+                self.tracker.wait_for_focus_change(5)
 
         except Exception as e:
             logger.error(f"Critical tracking error: {e}", exc_info=True)
@@ -824,6 +837,9 @@ class TimeTrackerGUI(ctk.CTk):
             app_totals = {}
             productive_seconds = 0
 
+            # Progress values are applied in one idle callback so Tk coalesces the redraws
+            progress_updates = []
+
             for date in dates:
                 if date not in self.tracker.data:
                     continue
@@ -850,11 +866,11 @@ class TimeTrackerGUI(ctk.CTk):
             prod_score = (productive_seconds / total_seconds * 100) if total_seconds > 0 else 0
             self.analytics_prod_label.configure(text=f"{prod_score:.0f}%")
             if prod_score >= 70:
-                self.analytics_prod_label.configure(text_color="#4caf50")
+                self.analytics_prod_label.configure(text_color=GREEN)
             elif prod_score >= 40:
-                self.analytics_prod_label.configure(text_color="#ff9800")
+                self.analytics_prod_label.configure(text_color=ORANGE)
             else:
-                self.analytics_prod_label.configure(text_color="#f44336")
+                self.analytics_prod_label.configure(text_color=RED)
 
             # Update top app
             if app_totals:
@@ -887,7 +903,7 @@ class TimeTrackerGUI(ctk.CTk):
 
                     progress = ctk.CTkProgressBar(frame, width=150)
                     progress.pack(side="left", padx=10)
-                    progress.set(min(percentage / 100, 1.0))
+                    progress_updates.append((progress, min(percentage / 100, 1.0)))
 
                     ctk.CTkLabel(
                         frame,
@@ -947,7 +963,7 @@ class TimeTrackerGUI(ctk.CTk):
                 daily_totals = []
                 for date in reversed(display_dates):
                     if date in self.tracker.data:
-                        day_total = sum(cat.get("total_seconds", 0) for cat in self.tracker.data[date].values() if isinstance(cat, dict))
+                        day_total = self.tracker.get_day_total(date)
                         daily_totals.append((date, day_total))
                     else:
                         daily_totals.append((date, 0))
@@ -972,7 +988,7 @@ class TimeTrackerGUI(ctk.CTk):
                     # Bar
                     progress = ctk.CTkProgressBar(frame, width=300)
                     progress.pack(side="left", padx=10)
-                    progress.set(seconds / max_seconds if max_seconds > 0 else 0)
+                    progress_updates.append((progress, seconds / max_seconds if max_seconds > 0 else 0))
 
                     # Hours
                     ctk.CTkLabel(
@@ -989,11 +1005,23 @@ class TimeTrackerGUI(ctk.CTk):
                     text_color="gray"
                 ).pack(pady=20)
 
+            if progress_updates:
+                self.after_idle(self._apply_progress_updates, progress_updates)
+
         except Exception as e:
             print(f"Analytics update error: {e}")
             import traceback
             traceback.print_exc()
 
+    def _apply_progress_updates(self, updates):
+        """Set a batch of progress bar values in a single idle pass"""
+        for progress, value in updates:
+            try:
+                progress.set(value)
+            except tk.TclError:
+                # Widget was destroyed by a newer refresh before the idle callback ran
+                pass
+
     def update_dashboard(self):
         """Update dashboard with current stats"""
         if not hasattr(self, 'current_app_label'):
@@ -1003,46 +1031,41 @@ class TimeTrackerGUI(ctk.CTk):
         try:
             # Update health indicator
             if self.last_error:
-                self.health_indicator.configure(text="⚠", text_color="#ff9800")
+                self._configure_if_changed("health", self.health_indicator, text="⚠", text_color=ORANGE)
             else:
-                self.health_indicator.configure(text="✓", text_color="#4caf50")
+                self._configure_if_changed("health", self.health_indicator, text="✓", text_color=GREEN)
 
             stats = self.tracker.get_session_stats()
 
             # Update current activity
             if self.tracker.current_app:
-                self.current_app_label.configure(text=self.tracker.current_app[:50])
+                self._configure_if_changed("app", self.current_app_label, text=self.tracker.current_app[:50])
                 duration = stats.get("current_app_time", 0)
                 mins = int(duration // 60)
                 secs = int(duration % 60)
-                self.current_duration_label.configure(text=f"{mins}m {secs}s")
+                self._configure_if_changed("duration", self.current_duration_label, text=f"{mins}m {secs}s")
 
-                category = self.tracker.categorize_app(self.tracker.current_app)
-                self.current_category_label.configure(text=f"Category: {category}")
+                category = self.tracker.get_current_category()
+                self._configure_if_changed("category", self.current_category_label, text=f"Category: {category}")
             else:
-                self.current_app_label.configure(text="Idle")
-                self.current_duration_label.configure(text="0m 0s")
-                self.current_category_label.configure(text="Category: None")
+                self._configure_if_changed("app", self.current_app_label, text="Idle")
+                self._configure_if_changed("duration", self.current_duration_label, text="0m 0s")
+                self._configure_if_changed("category", self.current_category_label, text="Category: None")
 
             # Update total time
             total_hours = stats.get("today_total", 0) / 3600
-            self.total_time_label.configure(text=f"{total_hours:.1f}h")
+            self._configure_if_changed("total", self.total_time_label, text=f"{total_hours:.1f}h")
 
             # Update streak
             streak = self.tracker.data.get("streaks", {}).get("current", 0)
-            self.streak_label.configure(text=f"{streak} days")
+            self._configure_if_changed("streak", self.streak_label, text=f"{streak} days")
 
             # Update categories
             self.update_category_bars(stats.get("today_by_category", {}))
 
             # Update focus mode status
             if hasattr(self, 'focus_status_label'):
-                if self.tracker.focus_mode:
-                    self.focus_status_label.configure(text="🎯 Active", text_color="#4caf50")
-                    self.focus_button.configure(text="⏸️ Deactivate Focus Mode")
-                else:
-                    self.focus_status_label.configure(text="Inactive", text_color="gray")
-                    self.focus_button.configure(text="🎯 Activate Focus Mode")
+                self._update_focus_status()
 
         except Exception as e:
             logger.error(f"Dashboard update error: {e}", exc_info=True)
@@ -1051,6 +1074,22 @@ class TimeTrackerGUI(ctk.CTk):
         # Schedule next update
         self.after(2000, self.update_dashboard)
 
+    def _configure_if_changed(self, key, widget, **kwargs):
+        """Configure a widget only when its options differ from the last dashboard update"""
+        if self._last_dash.get(key) == kwargs:
+            return
+        widget.configure(**kwargs)
+        self._last_dash[key] = kwargs
+
+    def _update_focus_status(self):
+        """Sync the focus mode label and button text with the tracker state"""
+        if self.tracker.focus_mode:
+            self._configure_if_changed("focus_status", self.focus_status_label, text="🎯 Active", text_color=GREEN)
+            self._configure_if_changed("focus_button", self.focus_button, text="⏸️ Deactivate Focus Mode")
+        else:
+            self._configure_if_changed("focus_status", self.focus_status_label, text="Inactive", text_color="gray")
+            self._configure_if_changed("focus_button", self.focus_button, text="🎯 Activate Focus Mode")
+
     def update_category_bars(self, categories):
         """Update category progress bars"""
         # Clear existing
@@ -1079,13 +1118,13 @@ class TimeTrackerGUI(ctk.CTk):
             ctk.CTkLabel(
                 header,
                 text=category,
-                font=ctk.CTkFont(size=13, weight="bold")
+                font=self.category_name_font
             ).pack(side="left")
 
             ctk.CTkLabel(
                 header,
                 text=f"{hours:.1f}h",
-                font=ctk.CTkFont(size=13),
+                font=self.category_hours_font,
                 text_color="gray"
             ).pack(side="right")
 
@@ -1117,12 +1156,11 @@ class TimeTrackerGUI(ctk.CTk):
 
         # Update UI immediately
         if hasattr(self, 'focus_status_label'):
+            self._update_focus_status()
             if self.tracker.focus_mode:
-                self.focus_status_label.configure(text="🎯 Active", text_color="#4caf50")
-                self.focus_button.configure(text="⏸️ Deactivate Focus Mode", fg_color="#ff5722", hover_color="#e64a19")
+                self.focus_button.configure(fg_color="#ff5722", hover_color="#e64a19")
             else:
-                self.focus_status_label.configure(text="Inactive", text_color="gray")
-                self.focus_button.configure(text="🎯 Activate Focus Mode", fg_color=("#3B8ED0", "#1F6AA5"), hover_color=("#36719F", "#144870"))
+                self.focus_button.configure(fg_color=("#3B8ED0", "#1F6AA5"), hover_color=("#36719F", "#144870"))
 
     def add_goal_dialog(self):
         """Show dialog to add new goal"""
@@ -1439,8 +1477,7 @@ class TimeTrackerGUI(ctk.CTk):
                 icon="warning"
             )
             if confirm:
-                self.tracker.data = {"streaks": {"current": 0, "longest": 0, "last_date": None}}
-                self.tracker.save_data()
+                self.tracker.clear_data()
                 messagebox.showinfo("Success", "All data has been cleared")
                 self.update_dashboard()
 
@@ -63,6 +63,8 @@ def main():
         ("plyer", "plyer (notifications)"),
         ("pystray", "pystray (system tray)"),
         ("PIL", "Pillow (images)"),
+        ("ahocorasick", "pyahocorasick (categorization)"),
+        ("orjson", "orjson (fast JSON)"),
     ]
 
     for module, name in feature_tests:
@@ -1,14 +1,22 @@
 import time
 import json
+import functools
+from operator import itemgetter
+from heapq import nlargest
+import atexit
+import mmap
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import OrderedDict, Counter
 import os
 import sys
 import csv
 import threading
+import itertools
 import hashlib
+import hmac
 import base64
 from pathlib import Path
+from typing import NamedTuple
 import re
 
 # Platform-specific imports
@@ -39,6 +47,12 @@ elif system == "Darwin":  # macOS
         HAS_TRAY = False
 elif system == "Linux":
     import subprocess
+    try:
+        from Xlib import X
+        from Xlib import display as xdisplay
+        HAS_XLIB = True
+    except ImportError:
+        HAS_XLIB = False
     try:
         from plyer import notification
         from pystray import Icon, Menu, MenuItem
@@ -47,12 +61,525 @@ elif system == "Linux":
     except ImportError:
         HAS_TRAY = False
 
+# Optional fast multi-keyword matching for app categorization
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Optional fast JSON encoding/decoding for data and config files
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Minimum seconds between snapshot rewrites for changes that are not journaled
+SAVE_INTERVAL_SECONDS = 30
+
+# Journaled time entries allowed before the data file snapshot is rewritten (compacted)
+JOURNAL_MAX_ENTRIES = 2000
+
+# Snapshot key holding the generation of the last journal folded into it
+JOURNAL_GEN_KEY = "_journal_gen"
+
+# Seconds between goal/break checks and between live dashboard redraws in the run loop
+NOTIFICATION_CHECK_SECONDS = 30
+DASHBOARD_REFRESH_SECONDS = 10
+
+# Data files larger than this are memory-mapped on load instead of read into a buffer
+MMAP_THRESHOLD_BYTES = 1_000_000
+
+# Multiplier converting seconds to hours in display loops
+HOURS_PER_SECOND = 1.0 / 3600
+
+# Category groupings used by the insights view
+INSIGHT_PRODUCTIVE_CATEGORIES = frozenset(("Coding", "Productivity"))
+INSIGHT_UNPRODUCTIVE_CATEGORIES = frozenset(("Entertainment",))
+
+# Most distinct uncategorized app titles remembered per session
+UNKNOWN_APPS_CAP = 500
+
+# Top-level keys of the data file that are not dates
+NON_DATE_KEYS = frozenset(("streaks",))
+
+# Most notification keys remembered for de-duplication
+NOTIFICATION_HISTORY_SIZE = 512
+
+def _read_json(path):
+    """Load a JSON file, using orjson when available"""
+    if HAS_ORJSON:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _read_json_mmap(path):
+    """Parse a large JSON file straight from a read-only memory map (requires orjson)"""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+def _print_lines(lines):
+    """Write display lines to stdout in a single call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _dumps_line(obj):
+    """Encode obj as one compact JSON line (bytes, newline-terminated)"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def _apply_time(data, date, category, app_name, seconds, project=None):
+    """Add seconds for an app to the nested day/category structure"""
+    day = data.get(date)
+    if day is None:
+        day = data[date] = {}
+
+    entry = day.get(category)
+    if entry is None:
+        entry = day[category] = {
+            "total_seconds": 0,
+            "apps": {},
+            "projects": {} if project else None
+        }
+
+    # Add time
+    apps = entry["apps"]
+    apps[app_name] = apps.get(app_name, 0) + seconds
+    entry["total_seconds"] += seconds
+
+    # Track by project if specified
+    if project and "projects" in entry:
+        projects = entry["projects"]
+        projects[project] = projects.get(project, 0) + seconds
+
+def _encode_json(obj, indent=False):
+    """Encode obj as JSON bytes (compact unless indent is set), using orjson when available"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def _write_json(path, obj, indent=False):
+    """Write obj as JSON (compact unless indent is set), using orjson when available"""
+    with open(path, 'wb') as f:
+        f.write(_encode_json(obj, indent))
+
+# ============ CODING & DEVELOPMENT ============
+CODING_KEYWORDS = [
+    # IDEs
+    'vscode', 'visual studio code', 'pycharm', 'intellij', 'webstorm', 'phpstorm',
+    'goland', 'rider', 'clion', 'datagrip', 'rubymine', 'appcode',
+    'eclipse', 'netbeans', 'android studio', 'xcode', 'sublime', 'atom',
+    'brackets', 'notepad++', 'vim', 'emacs', 'nano', 'gedit',
+    'code.exe', 'code - insiders',
+    # Specialized editors
+    'jupyter', 'spyder', 'rstudio', 'matlab', 'octave',
+    'postman', 'insomnia', 'swagger',
+    # Terminal/Command line
+    'terminal', 'iterm', 'cmd.exe', 'powershell', 'wsl', 'bash', 'zsh',
+    'windows terminal', 'hyper', 'alacritty', 'kitty', 'terminator',
+    'putty', 'winscp', 'filezilla',
+    # Version control
+    'gitkraken', 'sourcetree', 'github desktop', 'tower', 'smartgit',
+    'tortoisegit', 'git gui',
+    # Database tools
+    'dbeaver', 'mysql workbench', 'pgadmin', 'sequel pro', 'tableplus',
+    'mongodb compass', 'redis', 'robo 3t',
+    # Dev tools
+    'docker', 'kubernetes', 'vagrant', 'virtualbox', 'vmware',
+    'wireshark', 'fiddler', 'charles proxy',
+]
+
+# ============ BROWSERS (with detailed detection) ============
+BROWSER_KEYWORDS = ['chrome', 'firefox', 'safari', 'edge', 'brave', 'opera',
+                    'vivaldi', 'arc', 'chromium', 'iexplore', 'internet explorer']
+
+# Browser sites: Development/Learning sites
+BROWSER_CODING_KEYWORDS = [
+    'github', 'gitlab', 'bitbucket', 'stackoverflow', 'stack overflow',
+    'leetcode', 'hackerrank', 'codepen', 'codesandbox', 'repl.it', 'jsfiddle',
+    'glitch', 'stackblitz', 'playcode', 'codeanywhere',
+    'mdn', 'w3schools', 'devdocs', 'docs.python', 'docs.microsoft',
+    'developer.mozilla', 'documentation', 'api reference', 'tutorial',
+    'udemy', 'coursera', 'edx', 'pluralsight', 'skillshare', 'freecodecamp',
+    'khan academy', 'codecademy', 'udacity', 'egghead', 'frontend masters',
+    'laracasts', 'treehouse', 'lynda', 'datacamp', 'educative',
+    # Dev tools sites
+    'vercel', 'netlify', 'heroku', 'railway', 'render', 'fly.io',
+    'aws console', 'azure portal', 'google cloud', 'digitalocean',
+    'cloudflare', 'mongodb atlas', 'supabase', 'planetscale',
+    'sentry', 'datadog', 'new relic', 'grafana', 'prometheus',
+]
+
+# Browser sites: Social Media
+BROWSER_SOCIAL_KEYWORDS = [
+    'facebook', 'twitter', 'instagram', 'tiktok', 'snapchat',
+    'reddit', 'pinterest', 'tumblr', 'linkedin', 'mastodon',
+    'threads', 'bluesky', 'whatsapp web', 'telegram web',
+]
+
+# Browser sites: Entertainment/Streaming
+BROWSER_ENTERTAINMENT_KEYWORDS = [
+    'youtube', 'netflix', 'twitch', 'hulu', 'disney', 'prime video',
+    'spotify', 'soundcloud', 'apple music', 'pandora', 'tidal',
+    'crunchyroll', 'funimation', 'hbo', 'peacock', 'paramount',
+]
+
+# Browser sites: News & Reading
+BROWSER_READING_KEYWORDS = [
+    'news', 'bbc', 'cnn', 'nytimes', 'guardian', 'reuters', 'medium',
+    'substack', 'forbes', 'techcrunch', 'hacker news', 'ycombinator',
+    'wikipedia', 'wikihow',
+]
+
+# Browser sites: Shopping
+BROWSER_SHOPPING_KEYWORDS = [
+    'amazon', 'ebay', 'etsy', 'aliexpress', 'walmart', 'target',
+    'shop', 'store', 'cart', 'checkout',
+]
+
+# Browser sites: Productivity/Tools
+BROWSER_PRODUCTIVITY_KEYWORDS = [
+    'gmail', 'outlook', 'calendar', 'google docs', 'google sheets',
+    'google drive', 'dropbox', 'notion', 'todoist', 'trello',
+    'asana', 'jira', 'monday.com', 'clickup', 'linear', 'airtable',
+    'coda', 'miro', 'figma', 'figjam', 'whimsical', 'lucidchart',
+    'canva - edit', 'excalidraw', 'obsidian publish',
+]
+
+# ============ COMMUNICATION ============
+COMMUNICATION_KEYWORDS = [
+    # Messaging/Chat
+    'slack', 'discord', 'teams', 'microsoft teams', 'zoom', 'skype',
+    'telegram', 'whatsapp', 'signal', 'element', 'matrix',
+    'messenger', 'wechat', 'line', 'viber', 'groupme', 'rocketchat',
+    'mattermost', 'zulip', 'gitter', 'chanty', 'flock',
+    # Email clients
+    'thunderbird', 'outlook', 'mail', 'spark', 'mailspring',
+    'mailbird', 'em client', 'postbox', 'claws mail',
+    # Video conferencing
+    'webex', 'gotomeeting', 'bluejeans', 'jitsi', 'meet',
+    'facetime', 'google meet', 'whereby', 'around', 'mmhmm',
+    'discord - voice', 'hangouts',
+]
+
+# ============ PRODUCTIVITY & OFFICE ============
+PRODUCTIVITY_KEYWORDS = [
+    # Microsoft Office
+    'word', 'winword', 'excel', 'powerpoint', 'onenote', 'access',
+    'publisher', 'outlook', 'microsoft 365', 'office', 'teams - calendar',
+    # Google Workspace
+    'google docs', 'google sheets', 'google slides', 'google drive',
+    'google calendar', 'google keep',
+    # Apple
+    'pages', 'numbers', 'keynote', 'reminders',
+    # Other office suites
+    'libreoffice', 'openoffice', 'wps office', 'calligra', 'onlyoffice',
+    # Note-taking & Knowledge Management
+    'notion', 'obsidian', 'evernote', 'onenote', 'simplenote',
+    'bear', 'roam', 'logseq', 'joplin', 'standard notes', 'remnote',
+    'typora', 'mark text', 'notable', 'craft', 'amplenote', 'mem',
+    'reflect', 'tana', 'capacities', 'anytype',
+    # PDF
+    'acrobat', 'pdf', 'foxit', 'preview', 'sumatra', 'pdf-xchange',
+    # Project management
+    'trello', 'asana', 'monday', 'clickup', 'basecamp', 'notion calendar',
+    'jira', 'confluence', 'linear', 'height', 'shortcut', 'pivotal tracker',
+    'youtrack', 'airtable', 'smartsheet', 'wrike', 'teamwork',
+    # Task Management
+    'todoist', 'things', 'any.do', 'microsoft to do', 'ticktick',
+    'omnifocus', 'taskwarrior', '2do', 'remember the milk',
+    # Spreadsheets/Data
+    'airtable', 'coda', 'excel', 'notion database', 'fibery',
+    # Time Management
+    'toggl', 'rescuetime', 'timely', 'clockify', 'harvest',
+    # Collaboration
+    'miro', 'mural', 'figjam', 'whimsical', 'lucidchart', 'draw.io',
+    'excalidraw', 'tldraw',
+]
+
+# ============ DESIGN & CREATIVE ============
+DESIGN_KEYWORDS = [
+    # Photo/Image editing
+    'photoshop', 'illustrator', 'indesign', 'lightroom', 'acrobat',
+    'gimp', 'inkscape', 'krita', 'affinity photo', 'affinity designer',
+    'sketch', 'figma', 'adobe xd', 'invision', 'framer', 'pixelmator',
+    'paint.net', 'paintshop', 'corel draw', 'canva', 'penpot',
+    'lunacy', 'photopea', 'fotor', 'pixlr',
+    # Video editing
+    'premiere', 'after effects', 'davinci resolve', 'final cut',
+    'imovie', 'filmora', 'camtasia', 'shotcut', 'kdenlive',
+    'vegas', 'avid', 'blender', 'olive', 'openshot',
+    # 3D modeling
+    'maya', 'cinema 4d', 'zbrush', 'houdini', '3ds max',
+    'unity', 'unreal', 'godot', 'substance painter', 'marmoset',
+    # Audio
+    'audacity', 'logic pro', 'ableton', 'fl studio', 'reaper',
+    'pro tools', 'garage band', 'cubase', 'studio one', 'ardour',
+    'lmms', 'caustic',
+    # UI/UX Design
+    'penpot', 'figma', 'sketch', 'axure', 'balsamiq', 'mockplus',
+    'principle', 'protopie', 'flinto', 'origami studio',
+]
+
+# ============ ENTERTAINMENT & MEDIA ============
+ENTERTAINMENT_KEYWORDS = [
+    # Streaming/Video
+    'spotify', 'apple music', 'itunes', 'music', 'vlc', 'windows media',
+    'quicktime', 'netflix', 'youtube', 'twitch', 'hulu', 'disney+',
+    'plex', 'kodi', 'jellyfin', 'emby', 'amazon prime video',
+    'hbo max', 'paramount+', 'peacock', 'apple tv', 'crunchyroll',
+    # Gaming platforms
+    'steam', 'epic games', 'epicgameslauncher', 'gog galaxy', 'origin', 'uplay',
+    'battle.net', 'battlenet', 'blizzard', 'riot client', 'riotclientservices',
+    'xbox', 'playstation', 'ea app', 'rockstar games launcher',
+    'bethesda launcher', 'itch.io', 'playnite',
+    # Games (common ones)
+    'minecraft', 'fortnite', 'valorant', 'league of legends', 'leagueoflegends',
+    'dota', 'dota2', 'counter-strike', 'csgo', 'cs2', 'overwatch',
+    'apex legends', 'apexlegends', 'rocket league', 'roblox', 'among us',
+    'fall guys', 'wow', 'world of warcraft', 'destiny', 'call of duty',
+    'gta', 'grand theft auto', 'red dead', 'elden ring', 'baldurs gate',
+    'cyberpunk', 'witcher', 'skyrim', 'fallout', 'halo', 'warzone',
+    'game', '.exe - ',  # catch-all for games
+    # Media players
+    'soundcloud', 'pandora', 'tidal', 'deezer', 'youtube music',
+    'foobar2000', 'winamp', 'clementine', 'rhythmbox',
+]
+
+# ============ SOCIAL MEDIA (apps) ============
+SOCIAL_KEYWORDS = [
+    'facebook', 'twitter', 'instagram', 'tiktok', 'snapchat',
+    'reddit', 'pinterest', 'linkedin', 'mastodon', 'threads',
+]
+
+# ============ EDUCATION & LEARNING ============
+EDUCATION_KEYWORDS = [
+    'anki', 'quizlet', 'duolingo', 'rosetta stone',
+    'mathematica', 'maple', 'geogebra', 'desmos',
+    'moodle', 'canvas', 'blackboard', 'schoology',
+    'zoom', 'google classroom',
+]
+
+# ============ UTILITIES & SYSTEM ============
+UTILITY_KEYWORDS = [
+    'calculator', 'notepad', 'textedit', 'finder', 'explorer',
+    'settings', 'control panel', 'system preferences',
+    'task manager', 'activity monitor', 'resource monitor',
+    '7-zip', 'winrar', 'winzip', 'archive utility',
+    'snipping tool', 'screenshot', 'greenshot', 'lightshot',
+]
+
+# ============ FINANCE ============
+FINANCE_KEYWORDS = [
+    'quickbooks', 'quicken', 'mint', 'ynab', 'personal capital',
+    'coinbase', 'robinhood', 'webull', 'etrade', 'fidelity',
+    'paypal', 'venmo', 'cash app', 'crypto',
+]
+
+# ============ READING & BOOKS ============
+READING_KEYWORDS = [
+    'kindle', 'apple books', 'calibre', 'goodreads',
+    'pocket', 'instapaper', 'readwise', 'reader',
+]
+
+# Checked in order; the first category with a matching keyword wins
+_CATEGORY_RULES = [
+    (CODING_KEYWORDS, "Coding"),
+    (BROWSER_KEYWORDS, "Browsing"),  # refined by _BROWSER_RULES
+    (COMMUNICATION_KEYWORDS, "Communication"),
+    (PRODUCTIVITY_KEYWORDS, "Productivity"),
+    (DESIGN_KEYWORDS, "Design"),
+    (ENTERTAINMENT_KEYWORDS, "Entertainment"),
+    (SOCIAL_KEYWORDS, "Social Media"),
+    (EDUCATION_KEYWORDS, "Education"),
+    (UTILITY_KEYWORDS, "Utilities"),
+    (FINANCE_KEYWORDS, "Finance"),
+    (READING_KEYWORDS, "Reading"),
+]
+
+_BROWSER_RULES = [
+    (BROWSER_CODING_KEYWORDS, "Coding"),
+    (BROWSER_SOCIAL_KEYWORDS, "Social Media"),
+    (BROWSER_ENTERTAINMENT_KEYWORDS, "Entertainment"),
+    (BROWSER_READING_KEYWORDS, "Reading"),
+    (BROWSER_SHOPPING_KEYWORDS, "Shopping"),
+    (BROWSER_PRODUCTIVITY_KEYWORDS, "Productivity"),
+]
+
+def _flatten_rules(rules):
+    """Flatten ordered (keywords, category) rules into unique (keyword, category, priority) entries"""
+    flat = {}
+    for priority, (keywords, category) in enumerate(rules):
+        for keyword in keywords:
+            # Keywords listed under several categories keep the highest-priority one
+            flat.setdefault(keyword, (keyword, category, priority))
+    return tuple(flat.values())
+
+# Single declarative keyword tables shared by both matchers
+_KEYWORD_RULES = _flatten_rules(_CATEGORY_RULES)
+_BROWSER_KEYWORD_RULES = _flatten_rules(_BROWSER_RULES)
+
+def _compile_keyword_rules(keyword_rules):
+    """Compile keyword rules into one substring regex per category, in priority order"""
+    by_priority = {}
+    for keyword, category, priority in keyword_rules:
+        by_priority.setdefault((priority, category), []).append(keyword)
+    return [
+        (re.compile("|".join(map(re.escape, keywords))), category)
+        for (_, category), keywords in sorted(by_priority.items(), key=lambda x: x[0][0])
+    ]
+
+def _build_automaton(keyword_rules):
+    """Build an Aho-Corasick automaton mapping each keyword to (priority, category)"""
+    automaton = ahocorasick.Automaton()
+    for keyword, category, priority in keyword_rules:
+        automaton.add_word(keyword, (priority, category))
+    automaton.make_automaton()
+    return automaton
+
+_CATEGORY_PATTERNS = _compile_keyword_rules(_KEYWORD_RULES)
+_BROWSER_PATTERNS = _compile_keyword_rules(_BROWSER_KEYWORD_RULES)
+
+if HAS_AHOCORASICK:
+    _CATEGORY_AUTOMATON = _build_automaton(_KEYWORD_RULES)
+    _BROWSER_AUTOMATON = _build_automaton(_BROWSER_KEYWORD_RULES)
+else:
+    _CATEGORY_AUTOMATON = None
+    _BROWSER_AUTOMATON = None
+
+# Pattern lists at least this long get their own automaton when pyahocorasick is available
+AUTOMATON_MIN_PATTERNS = 8
+
+def _build_pattern_automaton(patterns):
+    """Build a membership automaton for a user pattern list, or None to use plain scanning"""
+    if not HAS_AHOCORASICK or len(patterns) < AUTOMATON_MIN_PATTERNS or "" in patterns:
+        return None
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+def _contains_any(app_lower, patterns, automaton):
+    """True if any of the lowercased patterns occurs in app_lower"""
+    if automaton is not None:
+        return next(automaton.iter(app_lower), None) is not None
+    return any(pattern in app_lower for pattern in patterns)
+
+def _first_match(app_lower, patterns, automaton):
+    """Return the category of the highest-priority keyword in app_lower, or None"""
+    if automaton is not None:
+        # One pass over the string finds every keyword; the lowest priority wins
+        best = min((value for _, value in automaton.iter(app_lower)), default=None)
+        return best[1] if best else None
+    for pattern, category in patterns:
+        if pattern.search(app_lower):
+            return category
+    return None
+
+# Common process/application names, looked up whole before any substring scanning
+_EXACT_APP_NAMES = (
+    'code.exe', 'code - insiders.exe', 'pycharm64.exe', 'webstorm64.exe',
+    'phpstorm64.exe', 'goland64.exe', 'rider64.exe', 'clion64.exe', 'datagrip64.exe',
+    'sublime_text.exe', 'notepad++.exe', 'eclipse.exe', 'android studio',
+    'cmd.exe', 'powershell.exe', 'windowsterminal.exe', 'wsl.exe', 'putty.exe',
+    'winscp.exe', 'filezilla.exe', 'gitkraken.exe', 'sourcetree.exe',
+    'dbeaver.exe', 'pgadmin4.exe', 'postman.exe',
+    'docker desktop.exe', 'wireshark.exe', 'rstudio.exe', 'matlab.exe',
+    'visual studio code', 'xcode', 'terminal', 'iterm2', 'pycharm',
+    'intellij idea', 'alacritty', 'kitty', 'gnome-terminal',
+)
+
+def _build_exact_app_map(names):
+    """Map names whose category no other title text can override (top-priority rule hits)"""
+    top_category = _CATEGORY_RULES[0][1]
+    return {
+        name: top_category for name in names
+        if _first_match(name, _CATEGORY_PATTERNS, None) == top_category
+    }
+
+_EXACT_APP_MAP = _build_exact_app_map(_EXACT_APP_NAMES)
+
+@functools.lru_cache(maxsize=8)
+def _custom_rules_automaton(custom_rules):
+    """Automaton over custom (pattern, category) rules in priority order, or None to scan them"""
+    if not HAS_AHOCORASICK or len(custom_rules) < AUTOMATON_MIN_PATTERNS:
+        return None
+    if any(not pattern for pattern, _ in custom_rules):
+        return None
+    flat = {}
+    for priority, (pattern, category) in enumerate(custom_rules):
+        # Patterns that collide after lowercasing keep the earliest rule, as the scan did
+        flat.setdefault(pattern, (pattern, category, priority))
+    return _build_automaton(flat.values())
+
+@functools.lru_cache(maxsize=4096)
+def _categorize_app_pure(app_lower, custom_rules):
+    """Categorize a lowercased app name; custom_rules is a tuple of (pattern, category)"""
+    # Check custom categories first
+    automaton = _custom_rules_automaton(custom_rules)
+    if automaton is not None:
+        best = min((value for _, value in automaton.iter(app_lower)), default=None)
+        if best:
+            return best[1]
+    else:
+        for pattern, category in custom_rules:
+            if pattern in app_lower:
+                return category
+
+    category = _first_match(app_lower, _CATEGORY_PATTERNS, _CATEGORY_AUTOMATON)
+    if category is None:
+        return "Other"
+    if category == "Browsing":
+        # Browsers are split further by the site being visited
+        return _first_match(app_lower, _BROWSER_PATTERNS, _BROWSER_AUTOMATON) or "Browsing"
+    return category
+
+class AppKey(NamedTuple):
+    """Window title paired with its lowercased form, computed once per tick"""
+    raw: str
+    lower: str
+
+def _app_key(app):
+    """Return app as an AppKey, lowercasing plain strings"""
+    if isinstance(app, AppKey):
+        return app
+    return AppKey(app, app.lower())
+
 class TimeTracker:
     def __init__(self, data_file="time_tracking.json", config_file="tracker_config.json"):
         self.data_file = data_file
         self.config_file = config_file
+        # Append-only log of time entries recorded since the last full save of data_file
+        self.journal_file = data_file + ".log"
+        self._journal = None
+        self._journal_entries = 0
+        # Generation of the journal currently being appended to, recorded in each snapshot
+        self._journal_gen = 0
+        # Guards self.data, the journal handle, snapshot rewrites and cached day totals
+        # across the tracking and GUI threads
+        self._data_lock = threading.RLock()
         self.data = self.load_data()
+        self._dirty = False
+        # Sorted date keys of self.data, rebuilt when the data object or its key count changes
+        self._sorted_dates = []
+        self._sorted_dates_key = None
+        # Per-date total seconds, filled on first read and kept current as time is added
+        self._day_totals = {}
+        self._day_totals_data = None  # the data dict _day_totals was computed from
+        self._last_save = time.monotonic()
+        # Bytes and mtime of the last config write, used to skip no-op rewrites
+        self._config_bytes = None
+        self._config_mtime = None
         self.config = self.load_config()
+        self._custom_cat_key = self._build_custom_cat_key()
+        self._build_app_filters()
         self.current_app = None
         self.start_time = None
         self.last_activity_time = time.time()
@@ -62,34 +589,154 @@ class TimeTracker:
         self.is_paused = False
         self.current_project = None
         self.session_start = datetime.now()
-        self.last_notification_time = {}
+        self.last_notification_time = OrderedDict()
         self.pomodoro_state = {"active": False, "work_time": 25*60, "break_time": 5*60, "cycles": 0}
         self.focus_mode = False
         self.unknown_apps = set()
         self.tray_icon = None
+        self._tray_images = None
         self.password_hash = self.config.get("password_hash", None)
 
+        # Cached "YYYY-MM-DD" key for today, valid until the next local midnight
+        self._today_str = ""
+        self._yesterday_str = ""
+        self._today_expires = 0.0
+
+        # Running totals for today, rebuilt on date rollover or when self.data is replaced
+        self._totals_key = None
+        self._today_total_seconds = 0
+        self._today_by_category = {}
+
+        # (app, category) for the app currently being tracked, replaced as a whole when
+        # current_app changes so other threads never see one app paired with another's category
+        self._category_cache = (None, None)
+
+        # Set by the focus watcher when the foreground window changes
+        self._focus_event = threading.Event()
+        self._focus_watcher_started = False
+
+        # Persistent X11 connection on Linux (None = not opened yet, False = unavailable)
+        self._x_display = None
+
         # Initialize streaks
         if "streaks" not in self.data:
             self.data["streaks"] = {"current": 0, "longest": 0, "last_date": None}
+
+        # Write any pending changes on interpreter exit
+        atexit.register(self.flush, force=True)
         
     def load_data(self):
         """Load existing tracking data"""
+        data = {}
         if os.path.exists(self.data_file):
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
-        return {}
+            if HAS_ORJSON and os.path.getsize(self.data_file) > MMAP_THRESHOLD_BYTES:
+                data = _read_json_mmap(self.data_file)
+            else:
+                data = _read_json(self.data_file)
+        # Snapshots written before journals were numbered predate any journal on disk
+        snapshot_gen = data.pop(JOURNAL_GEN_KEY, -1)
+        # Running totals for today belong to the data being replaced
+        self._totals_key = None
+        self._journal_gen = snapshot_gen + 1
+        self._replay_journal(data, snapshot_gen)
+        return data
+
+    def _replay_journal(self, data, snapshot_gen):
+        """Fold time entries journaled after the last full save back into data"""
+        if not os.path.exists(self.journal_file):
+            return
+        loads = orjson.loads if HAS_ORJSON else json.loads
+        with open(self.journal_file, 'rb') as f:
+            lines = iter(f)
+            first = next(lines, b"")
+            try:
+                header = loads(first)
+            except ValueError:
+                header = None
+            if isinstance(header, dict) and "g" in header:
+                gen = header["g"]
+            else:
+                # Unnumbered journal from an older version; its first line is an entry
+                gen = 0
+                lines = itertools.chain((first,), lines)
+            if gen <= snapshot_gen:
+                # Left behind by a crash after the snapshot that already holds it was saved
+                f.close()
+                os.remove(self.journal_file)
+                return
+            self._journal_gen = gen
+            for line in lines:
+                try:
+                    entry = loads(line)
+                except ValueError:
+                    # Partially written last line from an interrupted run
+                    continue
+                _apply_time(data, entry["d"], entry["c"], entry["a"], entry["s"], entry.get("p"))
+                self._journal_entries += 1
 
     def save_data(self):
         """Save tracking data to file"""
-        with open(self.data_file, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        with self._data_lock:
+            # The snapshot records which journal it absorbs, so a crash before that
+            # journal is removed cannot make load_data replay it a second time
+            snapshot = dict(self.data)
+            snapshot[JOURNAL_GEN_KEY] = self._journal_gen
+            # Write to a temp file and swap it in so a crash never leaves a torn file
+            tmp_file = self.data_file + ".tmp"
+            _write_json(tmp_file, snapshot)
+            os.replace(tmp_file, self.data_file)
+
+            # The snapshot now contains every journaled entry, so start a fresh journal
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            self._journal_gen += 1
+            self._journal_entries = 0
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+    def _append_journal(self, date, category, app_name, seconds, project=None):
+        """Append one time entry to the journal instead of rewriting the whole data file"""
+        entry = {"d": date, "c": category, "a": app_name, "s": seconds}
+        if project:
+            entry["p"] = project
+        with self._data_lock:
+            if self._journal is None:
+                self._journal = open(self.journal_file, 'a+b')
+                if self._journal.seek(0, os.SEEK_END) == 0:
+                    self._journal.write(_dumps_line({"g": self._journal_gen}))
+                else:
+                    # Terminate a partial line left by an interrupted run before appending
+                    self._journal.seek(-1, os.SEEK_END)
+                    if self._journal.read(1) != b"\n":
+                        self._journal.write(b"\n")
+            self._journal.write(_dumps_line(entry))
+            self._journal_entries += 1
+
+    def _mark_dirty(self):
+        """Flag tracking data as changed in a way the journal does not capture"""
+        self._dirty = True
+
+    def flush(self, force=False):
+        """Persist pending changes: flush the journal and rewrite the snapshot when due"""
+        with self._data_lock:
+            if self._journal is not None:
+                self._journal.flush()
+            if force:
+                if self._dirty or self._journal_entries:
+                    self.save_data()
+                return
+            if self._journal_entries >= JOURNAL_MAX_ENTRIES:
+                self.save_data()
+            elif self._dirty and time.monotonic() - self._last_save >= SAVE_INTERVAL_SECONDS:
+                self.save_data()
 
     def load_config(self):
         """Load configuration"""
         if os.path.exists(self.config_file):
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
+            return _read_json(self.config_file)
         # Default config
         default_config = {
             "idle_threshold_seconds": 300,
@@ -117,8 +764,43 @@ class TimeTracker:
         """Save configuration"""
         if config is None:
             config = self.config
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        new_bytes = _encode_json(config, indent=True)
+        if not self._config_unchanged(new_bytes):
+            tmp_file = self.config_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(new_bytes)
+            os.replace(tmp_file, self.config_file)
+            self._config_bytes = new_bytes
+            self._config_mtime = os.path.getmtime(self.config_file)
+        if config is getattr(self, "config", None):
+            self._custom_cat_key = self._build_custom_cat_key()
+            _categorize_app_pure.cache_clear()
+            _custom_rules_automaton.cache_clear()
+            self._category_cache = (None, None)
+            self._build_app_filters()
+
+    def _config_unchanged(self, new_bytes):
+        """True if new_bytes match what we last wrote and the file was not touched since"""
+        if new_bytes != self._config_bytes:
+            return False
+        try:
+            return os.path.getmtime(self.config_file) == self._config_mtime
+        except OSError:
+            return False
+
+    def _build_app_filters(self):
+        """Precompute lowercased excluded and focus-blocked app patterns from the config"""
+        self._excluded_lower = tuple(x.lower() for x in self.config.get("excluded_apps", []))
+        self._blocked_lower = tuple(x.lower() for x in self.config.get("focus_mode_blocked", []))
+        self._excluded_ac = _build_pattern_automaton(self._excluded_lower)
+        self._blocked_ac = _build_pattern_automaton(self._blocked_lower)
+
+    def _build_custom_cat_key(self):
+        """Hashable snapshot of custom category rules for the categorization cache"""
+        return tuple(
+            (pattern.lower(), category)
+            for pattern, category in self.config.get("custom_categories", {}).items()
+        )
     
     def get_active_window_windows(self):
         """Get active window name on Windows"""
@@ -141,8 +823,38 @@ class TimeTracker:
         except:
             return "Unknown"
     
+    def _get_x_display(self):
+        """Open (once) and return the X11 display connection, or None if unavailable"""
+        if self._x_display is None:
+            self._x_display = False
+            if system == "Linux" and HAS_XLIB:
+                try:
+                    self._x_display = xdisplay.Display()
+                    self._net_active_window = self._x_display.intern_atom('_NET_ACTIVE_WINDOW')
+                    self._net_wm_name = self._x_display.intern_atom('_NET_WM_NAME')
+                except Exception:
+                    self._x_display = False
+        return self._x_display or None
+
     def get_active_window_linux(self):
         """Get active window name on Linux"""
+        display = self._get_x_display()
+        if display:
+            try:
+                root = display.screen().root
+                active = root.get_full_property(self._net_active_window, X.AnyPropertyType)
+                if not active or not active.value:
+                    return "Unknown"
+                window = display.create_resource_object('window', active.value[0])
+                name = window.get_full_property(self._net_wm_name, X.AnyPropertyType)
+                title = name.value if name else window.get_wm_name()
+                if isinstance(title, bytes):
+                    title = title.decode('utf-8', 'replace')
+                return title or "Unknown"
+            except Exception:
+                return "Unknown"
+
+        # No usable X connection (e.g. Wayland or python-xlib missing): fall back to xdotool
         try:
             result = subprocess.run(
                 ['xdotool', 'getactivewindow', 'getwindowname'],
@@ -162,6 +874,65 @@ class TimeTracker:
             return self.get_active_window_linux()
         return "Unknown"
     
+    def start_focus_watcher(self):
+        """Start a background watcher that wakes the tracking loop on foreground window changes"""
+        if self._focus_watcher_started:
+            return
+        if system == "Windows":
+            target = self._watch_focus_windows
+        elif system == "Linux" and HAS_XLIB:
+            target = self._watch_focus_linux
+        else:
+            # No native focus event source; the loop keeps its timed polling
+            return
+        self._focus_watcher_started = True
+        threading.Thread(target=target, daemon=True).start()
+
+    def _watch_focus_windows(self):
+        """Pump a WinEvent hook for EVENT_SYSTEM_FOREGROUND on this thread"""
+        from ctypes import wintypes
+        EVENT_SYSTEM_FOREGROUND = 0x0003
+        WINEVENT_OUTOFCONTEXT = 0x0000
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        user32 = ctypes.windll.user32
+        # Keep a reference to the callback for as long as the hook is installed
+        callback = WinEventProc(lambda *args: self._focus_event.set())
+        hook = user32.SetWinEventHook(
+            EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND,
+            0, callback, 0, 0, WINEVENT_OUTOFCONTEXT
+        )
+        if not hook:
+            self._focus_watcher_started = False
+            return
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        user32.UnhookWinEvent(hook)
+
+    def _watch_focus_linux(self):
+        """Block on PropertyNotify for _NET_ACTIVE_WINDOW using a dedicated X connection"""
+        try:
+            # Xlib connections are not thread-safe, so the watcher opens its own
+            display = xdisplay.Display()
+            net_active_window = display.intern_atom('_NET_ACTIVE_WINDOW')
+            root = display.screen().root
+            root.change_attributes(event_mask=X.PropertyChangeMask)
+            while True:
+                event = display.next_event()
+                if event.type == X.PropertyNotify and event.atom == net_active_window:
+                    self._focus_event.set()
+        except Exception:
+            self._focus_watcher_started = False
+
+    def wait_for_focus_change(self, timeout):
+        """Sleep up to timeout seconds, returning early if the foreground window changes"""
+        self._focus_event.wait(timeout)
+        self._focus_event.clear()
+
     def get_idle_time(self):
         """Get system idle time in seconds"""
         if system == "Windows":
@@ -179,7 +950,14 @@ class TimeTracker:
                 Quartz.kCGAnyInputEventType
             )
         else:
-            # Linux - approximate using xprintidle if available
+            # Linux - query the MIT-SCREEN-SAVER extension over the shared X connection
+            display = self._get_x_display()
+            if display:
+                try:
+                    return display.screen().root.screensaver_query_info().idle / 1000.0
+                except Exception:
+                    pass
+            # Otherwise approximate using xprintidle if available
             try:
                 result = subprocess.run(['xprintidle'], capture_output=True, text=True)
                 return int(result.stdout.strip()) / 1000.0
@@ -188,279 +966,47 @@ class TimeTracker:
 
     def categorize_app(self, app_name):
         """Categorize apps into groups with extensive recognition"""
-        app_lower = app_name.lower()
-
-        # Check custom categories first
-        for pattern, category in self.config.get("custom_categories", {}).items():
-            if pattern.lower() in app_lower:
+        app_lower = _app_key(app_name).lower
+        if not self._custom_cat_key:
+            # Custom rules match anywhere in the title, so only skip the scan without them
+            category = _EXACT_APP_MAP.get(app_lower.partition(" - ")[0])
+            if category is not None:
                 return category
-
-        # ============ CODING & DEVELOPMENT ============
-        coding_keywords = [
-            # IDEs
-            'vscode', 'visual studio code', 'pycharm', 'intellij', 'webstorm', 'phpstorm',
-            'goland', 'rider', 'clion', 'datagrip', 'rubymine', 'appcode',
-            'eclipse', 'netbeans', 'android studio', 'xcode', 'sublime', 'atom',
-            'brackets', 'notepad++', 'vim', 'emacs', 'nano', 'gedit',
-            'code.exe', 'code - insiders',
-            # Specialized editors
-            'jupyter', 'spyder', 'rstudio', 'matlab', 'octave',
-            'postman', 'insomnia', 'swagger',
-            # Terminal/Command line
-            'terminal', 'iterm', 'cmd.exe', 'powershell', 'wsl', 'bash', 'zsh',
-            'windows terminal', 'hyper', 'alacritty', 'kitty', 'terminator',
-            'putty', 'winscp', 'filezilla',
-            # Version control
-            'gitkraken', 'sourcetree', 'github desktop', 'tower', 'smartgit',
-            'tortoisegit', 'git gui',
-            # Database tools
-            'dbeaver', 'mysql workbench', 'pgadmin', 'sequel pro', 'tableplus',
-            'mongodb compass', 'redis', 'robo 3t',
-            # Dev tools
-            'docker', 'kubernetes', 'vagrant', 'virtualbox', 'vmware',
-            'wireshark', 'fiddler', 'charles proxy',
-        ]
-
-        if any(x in app_lower for x in coding_keywords):
-            return "Coding"
-
-        # ============ BROWSERS (with detailed detection) ============
-        browser_keywords = ['chrome', 'firefox', 'safari', 'edge', 'brave', 'opera',
-                           'vivaldi', 'arc', 'chromium', 'iexplore', 'internet explorer']
-
-        if any(x in app_lower for x in browser_keywords):
-            # Development/Learning sites
-            if any(x in app_lower for x in [
-                'github', 'gitlab', 'bitbucket', 'stackoverflow', 'stack overflow',
-                'leetcode', 'hackerrank', 'codepen', 'codesandbox', 'repl.it', 'jsfiddle',
-                'glitch', 'stackblitz', 'playcode', 'codeanywhere',
-                'mdn', 'w3schools', 'devdocs', 'docs.python', 'docs.microsoft',
-                'developer.mozilla', 'documentation', 'api reference', 'tutorial',
-                'udemy', 'coursera', 'edx', 'pluralsight', 'skillshare', 'freecodecamp',
-                'khan academy', 'codecademy', 'udacity', 'egghead', 'frontend masters',
-                'laracasts', 'treehouse', 'lynda', 'datacamp', 'educative',
-                # Dev tools sites
-                'vercel', 'netlify', 'heroku', 'railway', 'render', 'fly.io',
-                'aws console', 'azure portal', 'google cloud', 'digitalocean',
-                'cloudflare', 'mongodb atlas', 'supabase', 'planetscale',
-                'sentry', 'datadog', 'new relic', 'grafana', 'prometheus',
-            ]):
-                return "Coding"
-
-            # Social Media
-            elif any(x in app_lower for x in [
-                'facebook', 'twitter', 'instagram', 'tiktok', 'snapchat',
-                'reddit', 'pinterest', 'tumblr', 'linkedin', 'mastodon',
-                'threads', 'bluesky', 'whatsapp web', 'telegram web',
-            ]):
-                return "Social Media"
-
-            # Entertainment/Streaming
-            elif any(x in app_lower for x in [
-                'youtube', 'netflix', 'twitch', 'hulu', 'disney', 'prime video',
-                'spotify', 'soundcloud', 'apple music', 'pandora', 'tidal',
-                'crunchyroll', 'funimation', 'hbo', 'peacock', 'paramount',
-            ]):
-                return "Entertainment"
-
-            # News & Reading
-            elif any(x in app_lower for x in [
-                'news', 'bbc', 'cnn', 'nytimes', 'guardian', 'reuters', 'medium',
-                'substack', 'forbes', 'techcrunch', 'hacker news', 'ycombinator',
-                'wikipedia', 'wikihow',
-            ]):
-                return "Reading"
-
-            # Shopping
-            elif any(x in app_lower for x in [
-                'amazon', 'ebay', 'etsy', 'aliexpress', 'walmart', 'target',
-                'shop', 'store', 'cart', 'checkout',
-            ]):
-                return "Shopping"
-
-            # Productivity/Tools
-            elif any(x in app_lower for x in [
-                'gmail', 'outlook', 'calendar', 'google docs', 'google sheets',
-                'google drive', 'dropbox', 'notion', 'todoist', 'trello',
-                'asana', 'jira', 'monday.com', 'clickup', 'linear', 'airtable',
-                'coda', 'miro', 'figma', 'figjam', 'whimsical', 'lucidchart',
-                'canva - edit', 'excalidraw', 'obsidian publish',
-            ]):
-                return "Productivity"
-
-            # General browsing
-            return "Browsing"
-
-        # ============ COMMUNICATION ============
-        communication_keywords = [
-            # Messaging/Chat
-            'slack', 'discord', 'teams', 'microsoft teams', 'zoom', 'skype',
-            'telegram', 'whatsapp', 'signal', 'element', 'matrix',
-            'messenger', 'wechat', 'line', 'viber', 'groupme', 'rocketchat',
-            'mattermost', 'zulip', 'gitter', 'chanty', 'flock',
-            # Email clients
-            'thunderbird', 'outlook', 'mail', 'spark', 'mailspring',
-            'mailbird', 'em client', 'postbox', 'claws mail',
-            # Video conferencing
-            'webex', 'gotomeeting', 'bluejeans', 'jitsi', 'meet',
-            'facetime', 'google meet', 'whereby', 'around', 'mmhmm',
-            'discord - voice', 'hangouts',
-        ]
-
-        if any(x in app_lower for x in communication_keywords):
-            return "Communication"
-
-        # ============ PRODUCTIVITY & OFFICE ============
-        productivity_keywords = [
-            # Microsoft Office
-            'word', 'winword', 'excel', 'powerpoint', 'onenote', 'access',
-            'publisher', 'outlook', 'microsoft 365', 'office', 'teams - calendar',
-            # Google Workspace
-            'google docs', 'google sheets', 'google slides', 'google drive',
-            'google calendar', 'google keep',
-            # Apple
-            'pages', 'numbers', 'keynote', 'reminders',
-            # Other office suites
-            'libreoffice', 'openoffice', 'wps office', 'calligra', 'onlyoffice',
-            # Note-taking & Knowledge Management
-            'notion', 'obsidian', 'evernote', 'onenote', 'simplenote',
-            'bear', 'roam', 'logseq', 'joplin', 'standard notes', 'remnote',
-            'typora', 'mark text', 'notable', 'craft', 'amplenote', 'mem',
-            'reflect', 'tana', 'capacities', 'anytype',
-            # PDF
-            'acrobat', 'pdf', 'foxit', 'preview', 'sumatra', 'pdf-xchange',
-            # Project management
-            'trello', 'asana', 'monday', 'clickup', 'basecamp', 'notion calendar',
-            'jira', 'confluence', 'linear', 'height', 'shortcut', 'pivotal tracker',
-            'youtrack', 'airtable', 'smartsheet', 'wrike', 'teamwork',
-            # Task Management
-            'todoist', 'things', 'any.do', 'microsoft to do', 'ticktick',
-            'omnifocus', 'taskwarrior', '2do', 'remember the milk',
-            # Spreadsheets/Data
-            'airtable', 'coda', 'excel', 'notion database', 'fibery',
-            # Time Management
-            'toggl', 'rescuetime', 'timely', 'clockify', 'harvest',
-            # Collaboration
-            'miro', 'mural', 'figjam', 'whimsical', 'lucidchart', 'draw.io',
-            'excalidraw', 'tldraw',
-        ]
-
-        if any(x in app_lower for x in productivity_keywords):
-            return "Productivity"
-
-        # ============ DESIGN & CREATIVE ============
-        design_keywords = [
-            # Photo/Image editing
-            'photoshop', 'illustrator', 'indesign', 'lightroom', 'acrobat',
-            'gimp', 'inkscape', 'krita', 'affinity photo', 'affinity designer',
-            'sketch', 'figma', 'adobe xd', 'invision', 'framer', 'pixelmator',
-            'paint.net', 'paintshop', 'corel draw', 'canva', 'penpot',
-            'lunacy', 'photopea', 'fotor', 'pixlr',
-            # Video editing
-            'premiere', 'after effects', 'davinci resolve', 'final cut',
-            'imovie', 'filmora', 'camtasia', 'shotcut', 'kdenlive',
-            'vegas', 'avid', 'blender', 'olive', 'openshot',
-            # 3D modeling
-            'maya', 'cinema 4d', 'zbrush', 'houdini', '3ds max',
-            'unity', 'unreal', 'godot', 'substance painter', 'marmoset',
-            # Audio
-            'audacity', 'logic pro', 'ableton', 'fl studio', 'reaper',
-            'pro tools', 'garage band', 'cubase', 'studio one', 'ardour',
-            'lmms', 'caustic',
-            # UI/UX Design
-            'penpot', 'figma', 'sketch', 'axure', 'balsamiq', 'mockplus',
-            'principle', 'protopie', 'flinto', 'origami studio',
-        ]
-
-        if any(x in app_lower for x in design_keywords):
-            return "Design"
-
-        # ============ ENTERTAINMENT & MEDIA ============
-        entertainment_keywords = [
-            # Streaming/Video
-            'spotify', 'apple music', 'itunes', 'music', 'vlc', 'windows media',
-            'quicktime', 'netflix', 'youtube', 'twitch', 'hulu', 'disney+',
-            'plex', 'kodi', 'jellyfin', 'emby', 'amazon prime video',
-            'hbo max', 'paramount+', 'peacock', 'apple tv', 'crunchyroll',
-            # Gaming platforms
-            'steam', 'epic games', 'epicgameslauncher', 'gog galaxy', 'origin', 'uplay',
-            'battle.net', 'battlenet', 'blizzard', 'riot client', 'riotclientservices',
-            'xbox', 'playstation', 'ea app', 'rockstar games launcher',
-            'bethesda launcher', 'itch.io', 'playnite',
-            # Games (common ones)
-            'minecraft', 'fortnite', 'valorant', 'league of legends', 'leagueoflegends',
-            'dota', 'dota2', 'counter-strike', 'csgo', 'cs2', 'overwatch',
-            'apex legends', 'apexlegends', 'rocket league', 'roblox', 'among us',
-            'fall guys', 'wow', 'world of warcraft', 'destiny', 'call of duty',
-            'gta', 'grand theft auto', 'red dead', 'elden ring', 'baldurs gate',
-            'cyberpunk', 'witcher', 'skyrim', 'fallout', 'halo', 'warzone',
-            'game', '.exe - ',  # catch-all for games
-            # Media players
-            'soundcloud', 'pandora', 'tidal', 'deezer', 'youtube music',
-            'foobar2000', 'winamp', 'clementine', 'rhythmbox',
-        ]
-
-        if any(x in app_lower for x in entertainment_keywords):
-            return "Entertainment"
-
-        # ============ SOCIAL MEDIA (apps) ============
-        social_keywords = [
-            'facebook', 'twitter', 'instagram', 'tiktok', 'snapchat',
-            'reddit', 'pinterest', 'linkedin', 'mastodon', 'threads',
-        ]
-
-        if any(x in app_lower for x in social_keywords):
-            return "Social Media"
-
-        # ============ EDUCATION & LEARNING ============
-        education_keywords = [
-            'anki', 'quizlet', 'duolingo', 'rosetta stone',
-            'mathematica', 'maple', 'geogebra', 'desmos',
-            'moodle', 'canvas', 'blackboard', 'schoology',
-            'zoom', 'google classroom',
-        ]
-
-        if any(x in app_lower for x in education_keywords):
-            return "Education"
-
-        # ============ UTILITIES & SYSTEM ============
-        utility_keywords = [
-            'calculator', 'notepad', 'textedit', 'finder', 'explorer',
-            'settings', 'control panel', 'system preferences',
-            'task manager', 'activity monitor', 'resource monitor',
-            '7-zip', 'winrar', 'winzip', 'archive utility',
-            'snipping tool', 'screenshot', 'greenshot', 'lightshot',
-        ]
-
-        if any(x in app_lower for x in utility_keywords):
-            return "Utilities"
-
-        # ============ FINANCE ============
-        finance_keywords = [
-            'quickbooks', 'quicken', 'mint', 'ynab', 'personal capital',
-            'coinbase', 'robinhood', 'webull', 'etrade', 'fidelity',
-            'paypal', 'venmo', 'cash app', 'crypto',
-        ]
-
-        if any(x in app_lower for x in finance_keywords):
-            return "Finance"
-
-        # ============ READING & BOOKS ============
-        reading_keywords = [
-            'kindle', 'apple books', 'calibre', 'goodreads',
-            'pocket', 'instapaper', 'readwise', 'reader',
-        ]
-
-        if any(x in app_lower for x in reading_keywords):
-            return "Reading"
-
-        return "Other"
+        return _categorize_app_pure(app_lower, self._custom_cat_key)
+
+    def get_current_category(self):
+        """Category of current_app, recategorized only when the tracked app changes"""
+        app = self.current_app
+        cached_app, category = self._category_cache
+        if app != cached_app:
+            category = self.categorize_app(app) if app else None
+            self._category_cache = (app, category)
+        return category
+
+    def _category_for(self, key):
+        """Categorize an AppKey, reusing the cached category when it is the current app"""
+        if key.raw == self.current_app:
+            return self.get_current_category()
+        return self.categorize_app(key)
+
+    def _today(self, now=None):
+        """Today's date key, reformatted only when the local date rolls over"""
+        if now is None:
+            now = time.time()
+        if now >= self._today_expires:
+            today = datetime.fromtimestamp(now)
+            self._today_str = today.strftime("%Y-%m-%d")
+            self._yesterday_str = (today - timedelta(days=1)).strftime("%Y-%m-%d")
+            next_midnight = datetime.combine(today.date() + timedelta(days=1), datetime.min.time())
+            self._today_expires = next_midnight.timestamp()
+        return self._today_str
 
     # ============ NEW FEATURES ============
 
     def set_password(self, password):
         """Set password for viewing stats"""
-        self.password_hash = hashlib.sha256(password.encode()).hexdigest()
+        digest = hashlib.sha256(password.encode()).digest()
+        self.password_hash = base64.b64encode(digest).decode("ascii")
         self.config["password_hash"] = self.password_hash
         self.save_config()
 
@@ -468,7 +1014,15 @@ class TimeTracker:
         """Check if password is correct"""
         if not self.password_hash:
             return True
-        return hashlib.sha256(password.encode()).hexdigest() == self.password_hash
+        if len(self.password_hash) == 64:
+            # Hex digest written by older versions
+            computed = hashlib.sha256(password.encode()).hexdigest().encode("ascii")
+            return hmac.compare_digest(computed, self.password_hash.lower().encode("ascii"))
+        try:
+            stored = base64.b64decode(self.password_hash, validate=True)
+        except ValueError:
+            return False
+        return hmac.compare_digest(hashlib.sha256(password.encode()).digest(), stored)
 
     def send_notification(self, title, message):
         """Send system notification"""
@@ -484,50 +1038,56 @@ class TimeTracker:
 
     def check_goal_notifications(self):
         """Check and send notifications for goals"""
-        today = datetime.now().strftime("%Y-%m-%d")
+        today = self._today()
         if today not in self.data:
             return
 
+        self._refresh_today_totals(today)
         for category, goal_hours in self.config.get("goals", {}).items():
-            if category in self.data[today]:
-                current_hours = self.data[today][category]["total_seconds"] / 3600
+            if category in self._today_by_category:
+                current_hours = self._today_by_category[category] / 3600
 
                 # Notify when goal is reached
                 if current_hours >= goal_hours:
-                    notif_key = f"goal_{category}_{today}"
-                    if notif_key not in self.last_notification_time:
+                    if not self._notif_seen(f"goal_{category}_{today}"):
                         self.send_notification(
                             "🎯 Goal Achieved!",
                             f"You've hit your {category} goal of {goal_hours}h today!"
                         )
-                        self.last_notification_time[notif_key] = time.time()
 
                 # Warn when over limit (if it's unproductive category)
                 if category == "Entertainment" and current_hours > goal_hours * 1.5:
-                    notif_key = f"warn_{category}_{today}"
-                    if notif_key not in self.last_notification_time:
+                    if not self._notif_seen(f"warn_{category}_{today}"):
                         self.send_notification(
                             "⚠️ Limit Warning",
                             f"You've spent {current_hours:.1f}h on {category} today (limit: {goal_hours}h)"
                         )
-                        self.last_notification_time[notif_key] = time.time()
 
     def check_break_reminder(self):
         """Remind user to take breaks"""
         interval = self.config.get("break_reminder_interval", 3600)
-        if time.time() - self.session_start.timestamp() > interval:
-            notif_key = f"break_{int(time.time() / interval)}"
-            if notif_key not in self.last_notification_time:
+        now = time.time()
+        if now - self.session_start.timestamp() > interval:
+            if not self._notif_seen(f"break_{int(now / interval)}", now):
                 self.send_notification(
                     "💆 Take a Break!",
                     f"You've been working for {interval//60} minutes. Time for a break!"
                 )
-                self.last_notification_time[notif_key] = time.time()
+
+    def _notif_seen(self, key, now=None):
+        """True if key was already notified; otherwise record it, evicting the oldest past the cap"""
+        if key in self.last_notification_time:
+            self.last_notification_time.move_to_end(key)
+            return True
+        self.last_notification_time[key] = time.time() if now is None else now
+        if len(self.last_notification_time) > NOTIFICATION_HISTORY_SIZE:
+            self.last_notification_time.popitem(last=False)
+        return False
 
     def update_streaks(self):
         """Update daily streaks"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        today = self._today()
+        yesterday = self._yesterday_str
 
         # Check if goals were met yesterday
         last_date = self.data["streaks"].get("last_date")
@@ -562,41 +1122,95 @@ class TimeTracker:
                 self.data["streaks"]["current"] = 0
 
             self.data["streaks"]["last_date"] = today
-            self.save_data()
+            self._mark_dirty()
 
     def is_app_blocked(self, app_name):
         """Check if app is blocked in focus mode"""
         if not self.focus_mode:
             return False
-        app_lower = app_name.lower()
-        blocked = self.config.get("focus_mode_blocked", [])
-        return any(blocked_app in app_lower for blocked_app in blocked)
+        return _contains_any(_app_key(app_name).lower, self._blocked_lower, self._blocked_ac)
 
-    def log_unknown_app(self, app_name):
+    def log_unknown_app(self, app_name, category=None):
         """Log apps that were categorized as Other"""
-        if self.categorize_app(app_name) == "Other":
-            self.unknown_apps.add(app_name)
+        key = _app_key(app_name)
+        if category is None:
+            category = self._category_for(key)
+        # Capped so a long session with ever-changing titles cannot grow it without bound
+        if category == "Other" and len(self.unknown_apps) < UNKNOWN_APPS_CAP:
+            self.unknown_apps.add(key.raw)
 
     def get_session_stats(self):
         """Get current session statistics"""
-        session_duration = (datetime.now() - self.session_start).total_seconds()
-        today = datetime.now().strftime("%Y-%m-%d")
+        # One clock read serves every figure below
+        now = time.time()
+        session_duration = now - self.session_start.timestamp()
+        today = self._today(now)
 
         stats = {
             "session_duration": session_duration,
             "current_app": self.current_app,
-            "current_app_time": time.time() - self.start_time if self.start_time else 0,
+            "current_app_time": now - self.start_time if self.start_time else 0,
             "today_total": 0,
             "today_by_category": {}
         }
 
-        if today in self.data:
-            stats["today_total"] = sum(cat["total_seconds"] for cat in self.data[today].values())
-            for category, data in self.data[today].items():
-                stats["today_by_category"][category] = data["total_seconds"] / 3600
+        with self._data_lock:
+            self._refresh_today_totals(today)
+            stats["today_total"] = self._today_total_seconds
+            for category, seconds in self._today_by_category.items():
+                stats["today_by_category"][category] = seconds / 3600
 
         return stats
 
+    def get_sorted_dates(self):
+        """Tracked date keys in ascending order (shared list; do not mutate)"""
+        # Days are only ever added, so the key count tells us when to re-sort
+        key = (id(self.data), len(self.data))
+        if self._sorted_dates_key != key:
+            self._sorted_dates = sorted(d for d in self.data if d not in NON_DATE_KEYS)
+            self._sorted_dates_key = key
+        return self._sorted_dates
+
+    def get_day_total(self, date):
+        """Total seconds tracked on date, summed once and then maintained incrementally"""
+        # Summing under the lock keeps a concurrent record_time from landing between the
+        # sum and the cache store, which would leave the cached total short
+        with self._data_lock:
+            if self._day_totals_data is not self.data:
+                self._day_totals = {}
+                self._day_totals_data = self.data
+            total = self._day_totals.get(date)
+            if total is None:
+                total = sum(data["total_seconds"] for data in self.data.get(date, {}).values())
+                self._day_totals[date] = total
+            return total
+
+    def _add_day_total(self, date, seconds):
+        """Keep a cached day total in step with time added to self.data (call with _data_lock held)"""
+        if self._day_totals_data is self.data and date in self._day_totals:
+            self._day_totals[date] += seconds
+
+    def clear_data(self):
+        """Replace all tracking data with an empty history and save it"""
+        with self._data_lock:
+            self.data = {"streaks": {"current": 0, "longest": 0, "last_date": None}}
+            self._day_totals = {}
+            self._day_totals_data = None
+            self._totals_key = None
+            self.save_data()
+
+    def _refresh_today_totals(self, today):
+        """Rebuild today's running totals if the date rolled over or self.data was replaced"""
+        # Rebuilding under the lock keeps record_time from adding a category mid-scan or
+        # landing an increment that the rebuilt totals already include
+        with self._data_lock:
+            if self._totals_key != today:
+                self._today_by_category = {
+                    category: data["total_seconds"] for category, data in self.data.get(today, {}).items()
+                }
+                self._today_total_seconds = sum(self._today_by_category.values())
+                self._totals_key = today
+
     def display_live_dashboard(self):
         """Display real-time dashboard"""
         stats = self.get_session_stats()
@@ -610,7 +1224,7 @@ class TimeTracker:
         print(f"\n📍 Current Activity:")
         if self.current_app:
             current_time = stats["current_app_time"]
-            category = self.categorize_app(self.current_app)
+            category = self.get_current_category()
             print(f"   App: {self.current_app[:50]}")
             print(f"   Category: {category}")
             print(f"   Duration: {int(current_time//60)}m {int(current_time%60)}s")
@@ -632,7 +1246,10 @@ class TimeTracker:
         total_hours = stats["today_total"] / 3600
         print(f"   Total: {total_hours:.2f}h tracked")
 
-        for category, hours in sorted(stats["today_by_category"].items(), key=lambda x: x[1], reverse=True):
+        # Sort the flat per-category seconds index rather than the nested day record
+        by_category = sorted(self._today_by_category.items(), key=itemgetter(1), reverse=True)
+        for category, seconds in by_category:
+            hours = seconds / 3600
             bar_length = int(hours * 2)
             bar = "█" * min(bar_length, 30)
             goal_str = ""
@@ -663,12 +1280,24 @@ class TimeTracker:
             dc.ellipse([8, 8, 56, 56], fill=color, outline='white', width=3)
             return image
 
+        # Render each state's image once and swap them on state changes
+        if self._tray_images is None:
+            self._tray_images = {color: create_image(color) for color in ('green', 'yellow', 'blue')}
+
+        def state_image():
+            if self.is_paused:
+                return self._tray_images['yellow']
+            if self.focus_mode:
+                return self._tray_images['blue']
+            return self._tray_images['green']
+
         def on_quit(icon, item):
             icon.stop()
             self.stop_tracking()
 
         def on_pause(icon, item):
             self.is_paused = not self.is_paused
+            icon.icon = state_image()
             if self.is_paused:
                 self.send_notification("⏸️ Paused", "Tracking paused")
             else:
@@ -676,6 +1305,7 @@ class TimeTracker:
 
         def on_focus(icon, item):
             self.focus_mode = not self.focus_mode
+            icon.icon = state_image()
             if self.focus_mode:
                 self.send_notification("🎯 Focus Mode", "Focus mode activated")
             else:
@@ -687,7 +1317,7 @@ class TimeTracker:
             MenuItem("Quit", on_quit)
         )
 
-        icon = Icon("TimeTracker", create_image('green'), "Time Tracker", menu)
+        icon = Icon("TimeTracker", state_image(), "Time Tracker", menu)
         return icon
 
     def start_tray_icon(self):
@@ -695,75 +1325,69 @@ class TimeTracker:
         if HAS_TRAY and self.tray_icon:
             threading.Thread(target=self.tray_icon.run, daemon=True).start()
 
-    def record_time(self, app_name, duration_seconds, project=None):
-        """Record time spent on an app"""
+    def record_time(self, app_name, duration_seconds, project=None, today=None):
+        """Record time spent on an app (today defaults to the current date key)"""
         # Check if app is excluded
-        if any(excluded in app_name.lower() for excluded in self.config.get("excluded_apps", [])):
+        key = _app_key(app_name)
+        if _contains_any(key.lower, self._excluded_lower, self._excluded_ac):
             return
 
-        today = datetime.now().strftime("%Y-%m-%d")
-        category = self.categorize_app(app_name)
+        if today is None:
+            today = self._today()
+        category = self._category_for(key)
 
         # Log unknown apps
-        self.log_unknown_app(app_name)
-
-        # Initialize data structure
-        if today not in self.data:
-            self.data[today] = {}
-
-        if category not in self.data[today]:
-            self.data[today][category] = {
-                "total_seconds": 0,
-                "apps": {},
-                "projects": {} if project else None
-            }
-
-        if app_name not in self.data[today][category]["apps"]:
-            self.data[today][category]["apps"][app_name] = 0
-
-        # Add time
-        self.data[today][category]["apps"][app_name] += duration_seconds
-        self.data[today][category]["total_seconds"] += duration_seconds
-
-        # Track by project if specified
-        if project and "projects" in self.data[today][category]:
-            if project not in self.data[today][category]["projects"]:
-                self.data[today][category]["projects"][project] = 0
-            self.data[today][category]["projects"][project] += duration_seconds
+        self.log_unknown_app(key, category)
+
+        # Add time in memory and journal the increment; holding the lock keeps a
+        # concurrent save_data from snapshotting one without the other
+        with self._data_lock:
+            _apply_time(self.data, today, category, key.raw, duration_seconds, project)
+            self._append_journal(today, category, key.raw, duration_seconds, project)
+            self._add_day_total(today, duration_seconds)
+            if self._totals_key == today:
+                self._today_total_seconds += duration_seconds
+                self._today_by_category[category] = self._today_by_category.get(category, 0) + duration_seconds
 
     def manual_time_entry(self, app_name, category, duration_minutes, project=None, date=None):
         """Manually add time entry"""
         if date is None:
-            date = datetime.now().strftime("%Y-%m-%d")
+            date = self._today()
 
-        if date not in self.data:
-            self.data[date] = {}
+        duration_seconds = duration_minutes * 60
 
-        if category not in self.data[date]:
-            self.data[date][category] = {
-                "total_seconds": 0,
-                "apps": {},
-                "projects": {}
-            }
+        with self._data_lock:
+            day = self.data.get(date)
+            if day is None:
+                day = self.data[date] = {}
 
-        duration_seconds = duration_minutes * 60
+            entry = day.get(category)
+            if entry is None:
+                entry = day[category] = {
+                    "total_seconds": 0,
+                    "apps": {},
+                    "projects": {}
+                }
 
-        if app_name not in self.data[date][category]["apps"]:
-            self.data[date][category]["apps"][app_name] = 0
+            apps = entry["apps"]
+            apps[app_name] = apps.get(app_name, 0) + duration_seconds
+            entry["total_seconds"] += duration_seconds
 
-        self.data[date][category]["apps"][app_name] += duration_seconds
-        self.data[date][category]["total_seconds"] += duration_seconds
+            if project:
+                projects = entry["projects"]
+                projects[project] = projects.get(project, 0) + duration_seconds
 
-        if project:
-            if project not in self.data[date][category]["projects"]:
-                self.data[date][category]["projects"][project] = 0
-            self.data[date][category]["projects"][project] += duration_seconds
+            # Today's per-category totals are rebuilt on the next stats read
+            self._totals_key = None
+            self._add_day_total(date, duration_seconds)
 
         self.save_data()
         print(f"✅ Added {duration_minutes}min to {app_name} ({category})")
 
     def stop_tracking(self):
         """Gracefully stop tracking"""
+        # Let a loop blocked in wait_for_focus_change notice the stop promptly
+        self._focus_event.set()
         if self.current_app:
             elapsed = time.time() - self.start_time
             self.record_time(self.current_app, elapsed, self.current_project)
@@ -775,17 +1399,25 @@ class TimeTracker:
             print(f"\nNo data tracked for {date_str}.")
             return
 
-        print(f"\n{'='*60}")
-        print(f"Time Tracking for {date_str}")
-        print(f"{'='*60}")
+        lines = [
+            f"\n{'='*60}",
+            f"Time Tracking for {date_str}",
+            f"{'='*60}",
+        ]
 
         # Calculate totals
-        total_seconds = sum(data["total_seconds"] for data in self.data[date_str].values())
-        total_hours = total_seconds / 3600
-
-        for category, data in sorted(self.data[date_str].items(), key=lambda x: x[1]["total_seconds"], reverse=True):
-            hours = data["total_seconds"] / 3600
-            percentage = (data["total_seconds"] / total_seconds * 100) if total_seconds > 0 else 0
+        total_seconds = self.get_day_total(date_str)
+        total_hours = total_seconds * HOURS_PER_SECOND
+        # Percent-per-second factor, so each row multiplies instead of dividing
+        total_pct = 100.0 / total_seconds if total_seconds > 0 else 0
+
+        ranked = sorted(
+            ((category, data["total_seconds"], data) for category, data in self.data[date_str].items()),
+            key=itemgetter(1), reverse=True
+        )
+        for category, cat_seconds, data in ranked:
+            hours = cat_seconds * HOURS_PER_SECOND
+            percentage = cat_seconds * total_pct
 
             # Check against goals
             goal_str = ""
@@ -796,23 +1428,26 @@ class TimeTracker:
                 else:
                     goal_str = f" (Goal: {goal}h - {goal-hours:.1f}h remaining)"
 
-            print(f"\n{category.upper()}: {hours:.2f}h ({percentage:.1f}%){goal_str}")
+            lines.append(f"\n{category.upper()}: {hours:.2f}h ({percentage:.1f}%){goal_str}")
 
-            for app, seconds in sorted(data["apps"].items(), key=lambda x: x[1], reverse=True)[:5]:
-                app_hours = seconds / 3600
-                app_percentage = (seconds / data["total_seconds"] * 100) if data["total_seconds"] > 0 else 0
-                print(f"  • {app}: {app_hours:.2f}h ({app_percentage:.1f}%)")
+            cat_pct = 100.0 / cat_seconds if cat_seconds > 0 else 0
+            for app, seconds in nlargest(5, data["apps"].items(), key=itemgetter(1)):
+                app_hours = seconds * HOURS_PER_SECOND
+                app_percentage = seconds * cat_pct
+                lines.append(f"  • {app}: {app_hours:.2f}h ({app_percentage:.1f}%)")
 
-            if len(data["apps"]) > 5:
-                print(f"  ... and {len(data['apps']) - 5} more apps")
+            app_count = len(data["apps"])
+            if app_count > 5:
+                lines.append(f"  ... and {app_count - 5} more apps")
 
-        print(f"\n{'='*60}")
-        print(f"TOTAL TIME TRACKED: {total_hours:.2f} hours")
-        print(f"{'='*60}\n")
+        lines.append(f"\n{'='*60}")
+        lines.append(f"TOTAL TIME TRACKED: {total_hours:.2f} hours")
+        lines.append(f"{'='*60}\n")
+        _print_lines(lines)
 
     def display_today(self):
         """Display today's stats"""
-        today = datetime.now().strftime("%Y-%m-%d")
+        today = self._today()
         self.display_day(today)
 
     def display_week(self):
@@ -820,39 +1455,51 @@ class TimeTracker:
         today = datetime.now()
         week_start = today - timedelta(days=today.weekday())
 
-        print(f"\n{'='*60}")
-        print(f"Weekly Summary (Week of {week_start.strftime('%Y-%m-%d')})")
-        print(f"{'='*60}")
+        lines = [
+            f"\n{'='*60}",
+            f"Weekly Summary (Week of {week_start.strftime('%Y-%m-%d')})",
+            f"{'='*60}",
+        ]
 
-        weekly_totals = defaultdict(lambda: {"total_seconds": 0, "apps": defaultdict(int)})
+        weekly_totals = {}
 
         for i in range(7):
             day = (week_start + timedelta(days=i)).strftime("%Y-%m-%d")
             if day in self.data:
                 for category, data in self.data[day].items():
-                    weekly_totals[category]["total_seconds"] += data["total_seconds"]
-                    for app, seconds in data["apps"].items():
-                        weekly_totals[category]["apps"][app] += seconds
+                    totals = weekly_totals.get(category)
+                    if totals is None:
+                        totals = weekly_totals[category] = {"total_seconds": 0, "apps": Counter()}
+                    totals["total_seconds"] += data["total_seconds"]
+                    # Counter.update sums a whole mapping in one call
+                    totals["apps"].update(data["apps"])
 
         if not weekly_totals:
-            print("\nNo data tracked this week.")
+            lines.append("\nNo data tracked this week.")
+            _print_lines(lines)
             return
 
         total_seconds = sum(data["total_seconds"] for data in weekly_totals.values())
-        total_hours = total_seconds / 3600
+        total_hours = total_seconds * HOURS_PER_SECOND
+        total_pct = 100.0 / total_seconds if total_seconds > 0 else 0
 
-        for category, data in sorted(weekly_totals.items(), key=lambda x: x[1]["total_seconds"], reverse=True):
-            hours = data["total_seconds"] / 3600
-            percentage = (data["total_seconds"] / total_seconds * 100) if total_seconds > 0 else 0
-            print(f"\n{category.upper()}: {hours:.2f}h ({percentage:.1f}%)")
+        ranked = sorted(
+            ((category, data["total_seconds"], data) for category, data in weekly_totals.items()),
+            key=itemgetter(1), reverse=True
+        )
+        for category, cat_seconds, data in ranked:
+            hours = cat_seconds * HOURS_PER_SECOND
+            percentage = cat_seconds * total_pct
+            lines.append(f"\n{category.upper()}: {hours:.2f}h ({percentage:.1f}%)")
 
-            for app, seconds in sorted(data["apps"].items(), key=lambda x: x[1], reverse=True)[:3]:
-                app_hours = seconds / 3600
-                print(f"  • {app}: {app_hours:.2f}h")
+            for app, seconds in nlargest(3, data["apps"].items(), key=itemgetter(1)):
+                app_hours = seconds * HOURS_PER_SECOND
+                lines.append(f"  • {app}: {app_hours:.2f}h")
 
-        print(f"\n{'='*60}")
-        print(f"TOTAL TIME TRACKED: {total_hours:.2f} hours")
-        print(f"{'='*60}\n")
+        lines.append(f"\n{'='*60}")
+        lines.append(f"TOTAL TIME TRACKED: {total_hours:.2f} hours")
+        lines.append(f"{'='*60}\n")
+        _print_lines(lines)
 
     def display_insights(self):
         """Display productivity insights"""
@@ -860,84 +1507,98 @@ class TimeTracker:
             print("\nNot enough data for insights.")
             return
 
-        print(f"\n{'='*60}")
-        print("Productivity Insights")
-        print(f"{'='*60}")
+        lines = [
+            f"\n{'='*60}",
+            "Productivity Insights",
+            f"{'='*60}",
+        ]
 
         # Get last 7 days
-        dates = sorted(self.data.keys())[-7:]
+        dates = self.get_sorted_dates()[-7:]
 
         # Average daily usage
-        productive_categories = ["Coding", "Productivity"]
-        unproductive_categories = ["Entertainment"]
-
         productive_hours = []
         unproductive_hours = []
         daily_totals = []
+        # Most productive day, tracked during the same pass (first day wins ties)
+        best_date, best_hours = None, -1.0
 
         for date in dates:
-            prod_time = sum(self.data[date].get(cat, {}).get("total_seconds", 0) for cat in productive_categories)
-            unprod_time = sum(self.data[date].get(cat, {}).get("total_seconds", 0) for cat in unproductive_categories)
-            total_time = sum(data["total_seconds"] for data in self.data[date].values())
-
-            productive_hours.append(prod_time / 3600)
+            # One walk over the day's categories yields all three totals
+            prod_time = unprod_time = total_time = 0
+            for category, data in self.data[date].items():
+                seconds = data["total_seconds"]
+                total_time += seconds
+                if category in INSIGHT_PRODUCTIVE_CATEGORIES:
+                    prod_time += seconds
+                elif category in INSIGHT_UNPRODUCTIVE_CATEGORIES:
+                    unprod_time += seconds
+
+            prod_hours = prod_time / 3600
+            productive_hours.append(prod_hours)
             unproductive_hours.append(unprod_time / 3600)
             daily_totals.append(total_time / 3600)
+            if prod_hours > best_hours:
+                best_date, best_hours = date, prod_hours
 
         if productive_hours:
-            print(f"\n📊 Last {len(dates)} days average:")
-            print(f"  • Productive time: {sum(productive_hours)/len(productive_hours):.2f}h/day")
-            print(f"  • Entertainment: {sum(unproductive_hours)/len(unproductive_hours):.2f}h/day")
-            print(f"  • Total tracked: {sum(daily_totals)/len(daily_totals):.2f}h/day")
+            lines.append(f"\n📊 Last {len(dates)} days average:")
+            lines.append(f"  • Productive time: {sum(productive_hours)/len(productive_hours):.2f}h/day")
+            lines.append(f"  • Entertainment: {sum(unproductive_hours)/len(unproductive_hours):.2f}h/day")
+            lines.append(f"  • Total tracked: {sum(daily_totals)/len(daily_totals):.2f}h/day")
 
         # Most productive day
-        if daily_totals:
-            most_productive_idx = productive_hours.index(max(productive_hours))
-            print(f"\n🏆 Most productive day: {dates[most_productive_idx]} ({productive_hours[most_productive_idx]:.2f}h productive)")
+        if best_date is not None:
+            lines.append(f"\n🏆 Most productive day: {best_date} ({best_hours:.2f}h productive)")
 
         # Top apps overall
-        all_apps = defaultdict(int)
-        for date_data in self.data.values():
-            for cat_data in date_data.values():
-                for app, seconds in cat_data["apps"].items():
-                    all_apps[app] += seconds
+        all_apps = Counter()
+        for date in self.get_sorted_dates():
+            for cat_data in self.data[date].values():
+                all_apps.update(cat_data["apps"])
 
-        print(f"\n⭐ Top 5 apps overall:")
-        for app, seconds in sorted(all_apps.items(), key=lambda x: x[1], reverse=True)[:5]:
-            print(f"  • {app}: {seconds/3600:.2f}h")
+        lines.append(f"\n⭐ Top 5 apps overall:")
+        for app, seconds in all_apps.most_common(5):
+            lines.append(f"  • {app}: {seconds/3600:.2f}h")
 
-        print(f"\n{'='*60}\n")
+        lines.append(f"\n{'='*60}\n")
+        _print_lines(lines)
 
     def export_csv(self, filename="time_tracking_export.csv"):
         """Export data to CSV"""
-        with open(filename, 'w', newline='') as f:
+        with open(filename, 'w', newline='', buffering=1 << 20) as f:
             writer = csv.writer(f)
             writer.writerow(["Date", "Category", "App", "Hours"])
 
-            for date in sorted(self.data.keys()):
-                for category, data in self.data[date].items():
-                    for app, seconds in data["apps"].items():
-                        writer.writerow([date, category, app, seconds / 3600])
+            # Feed every row through one writerows call
+            writer.writerows(
+                (date, category, app, seconds / 3600)
+                for date in self.get_sorted_dates()
+                for category, data in self.data[date].items()
+                for app, seconds in data["apps"].items()
+            )
 
         print(f"\n✅ Data exported to {filename}")
 
     def list_previous_days(self, num_days=10):
         """List previous tracked days"""
-        dates = sorted(self.data.keys(), reverse=True)[:num_days]
+        dates = self.get_sorted_dates()[-num_days:][::-1] if num_days > 0 else []
 
         if not dates:
             print("\nNo previous days tracked.")
             return
 
-        print(f"\n{'='*60}")
-        print(f"Last {len(dates)} Tracked Days")
-        print(f"{'='*60}\n")
+        lines = [
+            f"\n{'='*60}",
+            f"Last {len(dates)} Tracked Days",
+            f"{'='*60}\n",
+        ]
 
         for date in dates:
-            total_seconds = sum(data["total_seconds"] for data in self.data[date].values())
-            total_hours = total_seconds / 3600
+            total_hours = self.get_day_total(date) / 3600
             categories = ", ".join(self.data[date].keys())
-            print(f"{date}: {total_hours:.2f}h tracked ({categories})")
+            lines.append(f"{date}: {total_hours:.2f}h tracked ({categories})")
+        _print_lines(lines)
     
     def run(self, check_interval=5, live_dashboard=False):
         """Main tracking loop with enhanced features"""
@@ -956,8 +1617,22 @@ class TimeTracker:
         # Update streaks
         self.update_streaks()
 
-        dashboard_update_counter = 0
-        notification_check_counter = 0
+        # Wake the loop on window switches instead of waiting out the full interval
+        self.start_focus_watcher()
+
+        # Periodic work runs on monotonic deadlines, since focus changes wake the loop early
+        last_notification_check = last_dashboard_update = time.monotonic()
+
+        # Bind per-tick methods to locals to skip repeated attribute lookups
+        get_idle_time = self.get_idle_time
+        get_active_window = self.get_active_window
+        is_app_blocked = self.is_app_blocked
+        record_time = self.record_time
+        flush = self.flush
+        today_key = self._today
+        clock = time.time
+        monotonic = time.monotonic
+        wait = self.wait_for_focus_change
 
         try:
             while True:
@@ -967,14 +1642,17 @@ class TimeTracker:
                     continue
 
                 # Check for idle time
-                idle_time = self.get_idle_time()
+                idle_time = get_idle_time()
 
                 if idle_time < self.idle_threshold:
-                    app = self.get_active_window()
+                    app = get_active_window()
 
                     if app and app != "Unknown":
+                        # Lowercase the title once for every check below
+                        key = AppKey(app, app.lower())
+
                         # Check if app is blocked in focus mode
-                        if self.is_app_blocked(app):
+                        if self.focus_mode and is_app_blocked(key):
                             self.send_notification(
                                 "🚫 Blocked App",
                                 f"{app[:30]} is blocked in focus mode"
@@ -989,21 +1667,24 @@ class TimeTracker:
                             time.sleep(check_interval)
                             continue
 
+                        # Snapshot the clock once so no time is lost between record and reset
+                        now = clock()
                         if self.current_app == app:
                             # Still on same app, add time
-                            elapsed = time.time() - self.start_time
+                            elapsed = now - self.start_time
                             if elapsed >= check_interval:
-                                self.record_time(app, elapsed, self.current_project)
-                                self.start_time = time.time()
-                                self.save_data()
+                                record_time(key, elapsed, self.current_project, today_key(now))
+                                self.start_time = now
+                                flush()
                         else:
                             # Switched to new app
                             if self.current_app:
-                                elapsed = time.time() - self.start_time
-                                self.record_time(self.current_app, elapsed, self.current_project)
+                                elapsed = now - self.start_time
+                                record_time(self.current_app, elapsed, self.current_project, today_key(now))
+                                flush()
 
                             self.current_app = app
-                            self.start_time = time.time()
+                            self.start_time = now
                             if not live_dashboard:
                                 print(f"Tracking: {app[:60]}")
                 else:
@@ -1015,20 +1696,18 @@ class TimeTracker:
                         self.start_time = None
 
                 # Check notifications every 30 seconds
-                notification_check_counter += 1
-                if notification_check_counter >= 6:  # 30 seconds at 5s intervals
+                tick = monotonic()
+                if tick - last_notification_check >= NOTIFICATION_CHECK_SECONDS:
                     self.check_goal_notifications()
                     self.check_break_reminder()
-                    notification_check_counter = 0
+                    last_notification_check = tick
 
                 # Update live dashboard every 10 seconds
-                if live_dashboard:
-                    dashboard_update_counter += 1
-                    if dashboard_update_counter >= 2:  # 10 seconds at 5s intervals
-                        self.display_live_dashboard()
-                        dashboard_update_counter = 0
+                if live_dashboard and tick - last_dashboard_update >= DASHBOARD_REFRESH_SECONDS:
+                    self.display_live_dashboard()
+                    last_dashboard_update = tick
 
-                time.sleep(check_interval)
+                wait(check_interval)
 
         except KeyboardInterrupt:
             # Record final time
@@ -1037,7 +1716,7 @@ class TimeTracker:
             # Show unknown apps
             if self.unknown_apps:
                 print(f"\n📝 Unknown apps detected ({len(self.unknown_apps)}):")
-                for app in list(self.unknown_apps)[:10]:
+                for app in itertools.islice(self.unknown_apps, 10):
                     print(f"  • {app[:60]}")
                 if len(self.unknown_apps) > 10:
                     print(f"  ... and {len(self.unknown_apps) - 10} more")
@@ -1221,7 +1900,7 @@ def main():
         elif choice == "12":
             if tracker.unknown_apps:
                 print(f"\n📝 Unknown Apps ({len(tracker.unknown_apps)}):")
-                for i, app in enumerate(list(tracker.unknown_apps), 1):
+                for i, app in enumerate(tracker.unknown_apps, 1):
                     print(f"{i}. {app}")
                 print("\nYou can add these to custom categories in settings.")
             else:
@@ -0,0 +1,12 @@
+"""
+Helpers for reading the tracker's per-day records
+"""
+
+# Keys in a day's record that are not categories
+RESERVED_KEYS = frozenset(('date', 'session_duration', 'idle_time', 'projects'))
+
+def category_hours(value):
+    """Hours for one category entry of a day (tracker records hold total_seconds)"""
+    if isinstance(value, dict):
+        return value.get("total_seconds", 0) / 3600
+    return value
@@ -2,16 +2,57 @@
 Interactive Analytics Charts for Time Tracker
 """
 
-import matplotlib
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 import customtkinter as ctk
 from datetime import datetime, timedelta
-from collections import defaultdict
+from bisect import bisect_left
+from functools import cache
+from types import SimpleNamespace
 import json
 
+from ui._day_data import RESERVED_KEYS, category_hours
+
+@cache
+def _mpl():
+    """Import matplotlib on first chart build, so app startup doesn't pay for it"""
+    # Object-oriented API only: pyplot would register every figure in its global manager
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import MaxNLocator
+    from matplotlib.dates import DateFormatter
+    return SimpleNamespace(FigureCanvasTkAgg=FigureCanvasTkAgg, Figure=Figure, MaxNLocator=MaxNLocator,
+                           DateFormatter=DateFormatter)
+
+def _rgba(hex_color):
+    """'#rrggbb' as a matplotlib RGBA tuple"""
+    return tuple(int(hex_color[i:i + 2], 16) / 255 for i in (1, 3, 5)) + (1.0,)
+
+# Dark theme colors as RGBA tuples, parsed once instead of on every draw
+_FIG_BG = _rgba('#1e1e1e')
+_AXES_BG = _rgba('#2b2b2b')
+_TEXT = _rgba('#ffffff')
+_PALETTE = [_rgba(c) for c in ('#2196F3', '#4CAF50', '#FF9800', '#F44336', '#9C27B0', '#00BCD4', '#FFEB3B')]
+_LINE = _PALETTE[0]
+
+def _recent_dates(tracker, days):
+    """Tracked date keys from `days` days ago onward, in order"""
+    # ISO dates sort as strings, so the cutoff is a bisect into the sorted index
+    cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    dates = tracker.get_sorted_dates()
+    return dates[bisect_left(dates, cutoff):]
+
+def _style_date_axes(ax, title, ylabel):
+    """Apply the dark theme to a date-by-hours chart, keeping tick work to a minimum"""
+    ax.set_xlabel('Date', color=_TEXT)
+    ax.set_ylabel(ylabel, color=_TEXT)
+    ax.set_title(title, color=_TEXT, fontsize=16, pad=20)
+    ax.set_facecolor(_AXES_BG)
+    ax.spines[['top', 'right']].set_visible(False)
+    # At most ~7 date labels, rotated through the Axes API rather than pyplot state
+    ax.xaxis.set_major_locator(_mpl().MaxNLocator(7, integer=True))
+    ax.tick_params(colors=_TEXT)
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.tick_params(which='minor', length=0)
+
 class AnalyticsCharts:
     """Creates interactive charts for time tracking analytics"""
 
@@ -19,56 +60,119 @@ class AnalyticsCharts:
         self.parent = parent
         self.tracker = tracker
 
+        # (frame, figure, axes, canvas) per chart, reused while the chart stays in the same frame
+        self._charts = {}
+        self._weekly_layout = None
+        self._weekly_bars = []
+        self._pie_state = None
+        self._trend_dates = None
+        self._trend_line = None
+        self._trend_fill = None
+        # Trend axes without the (animated) line and shading, captured after each full draw
+        self._trend_bg = None
+
+    def _chart(self, name, frame, figsize):
+        """Return (fig, ax, canvas, created), reusing the figure already embedded in frame"""
+        cached = self._charts.get(name)
+        if cached is not None and cached[0] is frame:
+            _, fig, ax, canvas = cached
+            return fig, ax, canvas, False
+        mpl = _mpl()
+        fig = mpl.Figure(figsize=figsize, facecolor=_FIG_BG)
+        ax = fig.add_subplot(111)
+        canvas = mpl.FigureCanvasTkAgg(fig, frame)
+        self._charts[name] = (frame, fig, ax, canvas)
+        return fig, ax, canvas, True
+
+    def close_charts(self):
+        """Tear down every embedded chart (call when the analytics tab closes)"""
+        for _, fig, _, canvas in self._charts.values():
+            canvas.get_tk_widget().destroy()
+            fig.clf()
+        self._charts.clear()
+        self._weekly_layout = None
+        self._weekly_bars = []
+        self._pie_state = None
+        self._trend_dates = None
+        self._trend_line = None
+        self._trend_fill = None
+        self._trend_bg = None
+
+    def _show(self, canvas, created):
+        """Draw and embed a new canvas, or schedule a redraw of a reused one"""
+        if created:
+            canvas.draw()
+            canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        else:
+            canvas.draw_idle()
+
     def create_weekly_chart(self, frame):
         """Create weekly time distribution chart"""
-        # Get last 7 days of data
-        data_by_day = defaultdict(lambda: defaultdict(float))
-
-        for date_str, day_data in self.tracker.data.items():
-            try:
-                date = datetime.strptime(date_str, "%Y-%m-%d")
-                if (datetime.now() - date).days <= 7:
-                    for category, hours in day_data.items():
-                        if category not in ['date', 'session_duration', 'idle_time', 'projects']:
-                            data_by_day[date_str][category] = hours
-            except:
-                continue
-
-        # Create figure
-        fig = Figure(figsize=(10, 6), facecolor='#1e1e1e')
-        ax = fig.add_subplot(111)
+        import numpy as np
 
-        # Prepare data
-        dates = sorted(data_by_day.keys())[-7:]
-        categories = set()
-        for day in dates:
-            categories.update(data_by_day[day].keys())
-
-        # Plot stacked bar chart
-        bottom = [0] * len(dates)
-        colors = ['#2196F3', '#4CAF50', '#FF9800', '#F44336', '#9C27B0', '#00BCD4', '#FFEB3B']
-
-        for i, category in enumerate(sorted(categories)):
-            values = [data_by_day[date].get(category, 0) for date in dates]
-            ax.bar(dates, values, bottom=bottom, label=category, color=colors[i % len(colors)])
-            bottom = [b + v for b, v in zip(bottom, values)]
-
-        ax.set_xlabel('Date', color='white')
-        ax.set_ylabel('Hours', color='white')
-        ax.set_title('Weekly Time Distribution', color='white', fontsize=16, pad=20)
-        ax.legend(loc='upper left', framealpha=0.9)
-        ax.tick_params(colors='white')
-        ax.set_facecolor('#2b2b2b')
-        fig.patch.set_facecolor('#1e1e1e')
-        plt.xticks(rotation=45)
+        # Get last 7 days of data
+        day_records = self.tracker.data
+        dates = _recent_dates(self.tracker, 7)[-7:]
+        categories = sorted({category for date_str in dates for category in day_records[date_str]
+                             if category not in RESERVED_KEYS})
+        cat_index = {category: j for j, category in enumerate(categories)}
+
+        # Dense (day, category) matrix of hours, filled in one pass
+        hours = np.zeros((len(dates), len(categories)))
+        for i, date_str in enumerate(dates):
+            for category, value in day_records[date_str].items():
+                j = cat_index.get(category)
+                if j is not None:
+                    hours[i, j] = category_hours(value)
+
+        # Each category's bars sit on the running total of the ones before it
+        bottoms = np.zeros_like(hours)
+        bottoms[:, 1:] = np.cumsum(hours, axis=1)[:, :-1]
+
+        fig, ax, canvas, created = self._chart('weekly', frame, (10, 6))
+
+        layout = (tuple(dates), tuple(categories))
+        if not created and layout == self._weekly_layout:
+            # Same days and categories as last time: just resize and restack the bars
+            for j, bars in enumerate(self._weekly_bars):
+                for rect, height, bottom in zip(bars, hours[:, j], bottoms[:, j]):
+                    rect.set_height(height)
+                    rect.set_y(bottom)
+            ax.relim()
+            ax.autoscale_view()
+        else:
+            ax.clear()
+
+            # Numeric day positions take matplotlib's date path instead of a categorical axis
+            days = np.array(dates, dtype='datetime64[D]')
+
+            # Plot stacked bar chart
+            self._weekly_bars = [
+                ax.bar(days, hours[:, j], bottom=bottoms[:, j], label=category,
+                       color=_PALETTE[j % len(_PALETTE)])
+                for j, category in enumerate(categories)
+            ]
+            self._weekly_layout = layout
+
+            _style_date_axes(ax, 'Weekly Time Distribution', 'Hours')
+            ax.xaxis.set_major_formatter(_mpl().DateFormatter('%m-%d'))
+            ax.legend(loc='upper left', framealpha=0.9)
 
         # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        self._show(canvas, created)
 
         return canvas
 
+    def _on_trend_draw(self, event):
+        """After a full draw, cache the trend background and paint the animated artists on it"""
+        if self._trend_line is None or self._trend_line.axes is None:
+            return
+        ax = self._trend_line.axes
+        self._trend_bg = event.canvas.copy_from_bbox(ax.bbox)
+        ax.draw_artist(self._trend_fill)
+        ax.draw_artist(self._trend_line)
+        event.canvas.blit(ax.bbox)
+
     def create_category_pie_chart(self, frame):
         """Create pie chart for category distribution"""
         # Get today's data
@@ -77,8 +181,10 @@ class AnalyticsCharts:
 
         categories = {}
         for key, value in today_data.items():
-            if key not in ['date', 'session_duration', 'idle_time', 'projects'] and value > 0:
-                categories[key] = value
+            if key not in RESERVED_KEYS:
+                hours = category_hours(value)
+                if hours > 0:
+                    categories[key] = hours
 
         if not categories:
             # Show message
@@ -87,29 +193,27 @@ class AnalyticsCharts:
             label.pack(pady=50)
             return None
 
-        # Create figure
-        fig = Figure(figsize=(8, 8), facecolor='#1e1e1e')
-        ax = fig.add_subplot(111)
+        # Nothing changed since the pie in this frame was drawn: keep it as is
+        state = (today, frozenset(categories.items()))
+        cached = self._charts.get('pie')
+        if cached is not None and cached[0] is frame and state == self._pie_state:
+            return cached[3]
 
-        colors = ['#2196F3', '#4CAF50', '#FF9800', '#F44336', '#9C27B0', '#00BCD4', '#FFEB3B']
+        fig, ax, canvas, created = self._chart('pie', frame, (8, 8))
+        ax.clear()
+        self._pie_state = state
 
         ax.pie(categories.values(), labels=categories.keys(), autopct='%1.1f%%',
-               colors=colors[:len(categories)], textprops={'color': 'white'})
-        ax.set_title("Today's Category Distribution", color='white', fontsize=16, pad=20)
-        fig.patch.set_facecolor('#1e1e1e')
+               colors=_PALETTE[:len(categories)], textprops={'color': _TEXT})
+        ax.set_title("Today's Category Distribution", color=_TEXT, fontsize=16, pad=20)
 
         # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        self._show(canvas, created)
 
         return canvas
 
     def create_productivity_heatmap(self, frame):
         """Create heatmap showing productivity by hour of day"""
-        # Aggregate data by hour
-        hourly_data = defaultdict(lambda: defaultdict(float))
-
         # This would require tracking hourly data - placeholder for now
         label = ctk.CTkLabel(frame, text="Hourly heatmap coming soon!\n(Requires hourly tracking data)",
                            font=ctk.CTkFont(size=16), text_color="gray")
@@ -119,47 +223,50 @@ class AnalyticsCharts:
 
     def create_trend_line_chart(self, frame):
         """Create line chart showing productivity trends"""
-        # Get last 30 days
-        data_by_day = {}
-
-        for date_str, day_data in self.tracker.data.items():
-            try:
-                date = datetime.strptime(date_str, "%Y-%m-%d")
-                if (datetime.now() - date).days <= 30:
-                    total_hours = sum(v for k, v in day_data.items()
-                                    if k not in ['date', 'session_duration', 'idle_time', 'projects'])
-                    data_by_day[date_str] = total_hours
-            except:
-                continue
-
-        if len(data_by_day) < 2:
+        # Get last 30 days; the tracker keeps per-day totals, so this is a lookup per day
+        dates = _recent_dates(self.tracker, 30)
+
+        if len(dates) < 2:
             label = ctk.CTkLabel(frame, text="Not enough data yet. Keep tracking!",
                                font=ctk.CTkFont(size=16), text_color="gray")
             label.pack(pady=50)
             return None
 
-        # Create figure
-        fig = Figure(figsize=(10, 6), facecolor='#1e1e1e')
-        ax = fig.add_subplot(111)
-
-        dates = sorted(data_by_day.keys())
-        hours = [data_by_day[d] for d in dates]
-
-        ax.plot(dates, hours, marker='o', color='#2196F3', linewidth=2, markersize=6)
-        ax.fill_between(range(len(dates)), hours, alpha=0.3, color='#2196F3')
-
-        ax.set_xlabel('Date', color='white')
-        ax.set_ylabel('Total Hours', color='white')
-        ax.set_title('30-Day Productivity Trend', color='white', fontsize=16, pad=20)
-        ax.tick_params(colors='white')
-        ax.set_facecolor('#2b2b2b')
-        ax.grid(True, alpha=0.2, color='white')
-        fig.patch.set_facecolor('#1e1e1e')
-        plt.xticks(rotation=45)
+        fig, ax, canvas, created = self._chart('trend', frame, (10, 6))
+        if created:
+            self._trend_bg = None
+            canvas.mpl_connect('draw_event', self._on_trend_draw)
+
+        hours = [self.tracker.get_day_total(d) / 3600 for d in dates]
+
+        if not created and dates == self._trend_dates:
+            # Same days as last time: update the line and its shading in place
+            ylim = ax.get_ylim()
+            self._trend_line.set_ydata(hours)
+            self._trend_fill.remove()
+            self._trend_fill = ax.fill_between(range(len(dates)), hours, alpha=0.3, color=_LINE,
+                                               animated=True)
+            ax.relim()
+            ax.autoscale_view()
+            if self._trend_bg is not None and ax.get_ylim() == ylim:
+                # Axes unchanged: repaint only the line over the cached background
+                canvas.restore_region(self._trend_bg)
+                ax.draw_artist(self._trend_fill)
+                ax.draw_artist(self._trend_line)
+                canvas.blit(ax.bbox)
+                return canvas
+        else:
+            ax.clear()
+            self._trend_line, = ax.plot(dates, hours, marker='o', color=_LINE, linewidth=2, markersize=6,
+                                        animated=True)
+            self._trend_fill = ax.fill_between(range(len(dates)), hours, alpha=0.3, color=_LINE,
+                                               animated=True)
+            self._trend_dates = dates
+
+            _style_date_axes(ax, '30-Day Productivity Trend', 'Total Hours')
+            ax.grid(True, alpha=0.2, color=_TEXT)
 
         # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        self._show(canvas, created)
 
         return canvas
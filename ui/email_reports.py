@@ -4,16 +4,77 @@ Email Reports for Time Tracker
 
 import customtkinter as ctk
 from tkinter import messagebox
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
 import json
 import os
 from datetime import datetime, timedelta
 import csv
+import io
+import math
+from operator import itemgetter
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ui._day_data import RESERVED_KEYS, category_hours
+
+# Optional fast JSON encoding/decoding for the config file
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Idle seconds after which a cached SMTP session is assumed closed by the server
+SMTP_KEEPALIVE_SECONDS = 60
+
+# Milliseconds between checks of a background send from the Tk thread
+SEND_POLL_MS = 100
+
+# Report page pieces, built once; only the header fields and rows vary per call
+_HTML_HEAD = """
+        <html>
+        <head>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 20px; }}
+                h1 {{ color: #2196F3; }}
+                table {{ border-collapse: collapse; width: 100%; margin-top: 20px; }}
+                th, td {{ border: 1px solid #ddd; padding: 12px; text-align: left; }}
+                th {{ background-color: #2196F3; color: white; }}
+                tr:nth-child(even) {{ background-color: #f2f2f2; }}
+                .footer {{ margin-top: 30px; color: gray; font-size: 12px; }}
+            </style>
+        </head>
+        <body>
+            <h1>⏱️ Time Tracker Report</h1>
+            <p><strong>Date:</strong> {today}</p>
+            <p><strong>Total Time:</strong> {total_hours:.2f} hours</p>
+
+            <h2>Category Breakdown</h2>
+            <table>
+                <tr>
+                    <th>Category</th>
+                    <th>Hours</th>
+                    <th>Percentage</th>
+                </tr>
+        """
+
+_HTML_ROW = """
+                <tr>
+                    <td>{}</td>
+                    <td>{:.2f}h</td>
+                    <td>{:.1f}%</td>
+                </tr>
+                """
+
+_HTML_TAIL = """
+            </table>
+
+            <div class="footer">
+                <p>Generated by Time Tracker Pro</p>
+            </div>
+        </body>
+        </html>
+        """
 
 class EmailReports:
     """Email reporting functionality"""
@@ -23,11 +84,20 @@ class EmailReports:
         self.tracker = tracker
         self.config_file = "email_config.json"
         self.config = self.load_config()
+        # Open SMTP session, kept between sends and checked with NOOP before reuse
+        self._smtp = None
+        self._smtp_key = None
+        self._smtp_deadline = 0.0
+        # Single worker serializes sends, so the session is never shared concurrently
+        self._email_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='smtp')
 
     def load_config(self):
         """Load email configuration"""
         if os.path.exists(self.config_file):
             try:
+                if HAS_ORJSON:
+                    with open(self.config_file, 'rb') as f:
+                        return orjson.loads(f.read())
                 with open(self.config_file, 'r') as f:
                     return json.load(f)
             except:
@@ -49,8 +119,15 @@ class EmailReports:
 
     def save_config(self):
         """Save email configuration"""
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        if HAS_ORJSON:
+            data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(self.config, indent=2).encode("utf-8")
+        # Write aside and swap in, so a crash never leaves a half-written config
+        tmp_file = self.config_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, self.config_file)
 
     def create_email_settings(self, frame):
         """Create email settings UI"""
@@ -226,15 +303,100 @@ class EmailReports:
         self.save_config()
         messagebox.showinfo("Success", "Email settings saved successfully!")
 
-    def send_test_email(self):
-        """Send a test email"""
+    def _connect_smtp(self):
+        """Open and authenticate a new SMTP session"""
+        import smtplib
+
+        host, port = self.config["smtp_server"], self.config["smtp_port"]
+        if port == 465:
+            # Implicit TLS, no STARTTLS upgrade round trip
+            server = smtplib.SMTP_SSL(host, port)
+            server.ehlo()
+        else:
+            server = smtplib.SMTP(host, port)
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.config["sender_email"]
-            msg['To'] = self.config["recipient_email"]
-            msg['Subject'] = "Time Tracker - Test Email"
+            server.login(self.config["sender_email"], self.config["sender_password"])
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _get_smtp(self):
+        """Return a live SMTP session, reconnecting only if the old one dropped"""
+        # Saved settings may point at a different server or account
+        key = (self.config["smtp_server"], self.config["smtp_port"],
+               self.config["sender_email"], self.config["sender_password"])
+        # Past the keepalive window the server has likely hung up, so skip the NOOP
+        if (self._smtp is not None and self._smtp_key == key
+                and time.monotonic() < self._smtp_deadline):
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except OSError:
+                pass
+        self.close_smtp()
+        self._smtp = self._connect_smtp()
+        self._smtp_key = key
+        return self._smtp
+
+    def close_smtp(self):
+        """Close the cached SMTP session, if any"""
+        server, self._smtp = self._smtp, None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+
+    def _send(self, msg):
+        """Send a message over the shared SMTP session"""
+        import smtplib
 
-            body = """
+        try:
+            self._get_smtp().send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Dropped between NOOP and send; retry once on a fresh session
+            self.close_smtp()
+            self._get_smtp().send_message(msg)
+        self._smtp_deadline = time.monotonic() + SMTP_KEEPALIVE_SECONDS
+
+    def _send_in_background(self, msg, on_success, error_title):
+        """Send on the email worker and report back through the Tk event loop"""
+        fut = self._email_pool.submit(self._send, msg)
+        # Tk calls are only safe on the main thread, so poll the future from there
+        self.parent.after(SEND_POLL_MS, self._send_done, fut, on_success, error_title)
+
+    def _send_done(self, fut, on_success, error_title):
+        """Show the outcome of a background send once it finishes (runs on the Tk thread)"""
+        if not fut.done():
+            self.parent.after(SEND_POLL_MS, self._send_done, fut, on_success, error_title)
+            return
+        error = fut.exception()
+        if error is not None:
+            messagebox.showerror("Error", f"{error_title}:\n{str(error)}")
+        else:
+            on_success()
+
+    def _new_message(self, subject):
+        """Empty message addressed from the configured sender to the recipient"""
+        from email.message import EmailMessage
+        from email import policy
+
+        msg = EmailMessage(policy=policy.SMTP)
+        msg['From'] = self.config["sender_email"]
+        msg['To'] = self.config["recipient_email"]
+        msg['Subject'] = subject
+        return msg
+
+    def _build_test_msg(self):
+        """Build the test email"""
+        sent_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        msg = self._new_message("Time Tracker - Test Email")
+
+        body = """
             <html>
             <body>
                 <h2>Time Tracker Test Email</h2>
@@ -244,138 +406,92 @@ class EmailReports:
                 <p><i>Sent at: {}</i></p>
             </body>
             </html>
-            """.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-
-            msg.attach(MIMEText(body, 'html'))
-
-            # Send
-            server = smtplib.SMTP(self.config["smtp_server"], self.config["smtp_port"])
-            server.starttls()
-            server.login(self.config["sender_email"], self.config["sender_password"])
-            server.send_message(msg)
-            server.quit()
-
-            messagebox.showinfo("Success", "Test email sent successfully!")
+            """.format(sent_at)
+
+        msg.set_content("This is a test email from your Time Tracker application.\n"
+                        f"Sent at: {sent_at}\n")
+        msg.add_alternative(body, subtype='html')
+        return msg
+
+    def _build_report_msg(self):
+        """Build the report email with its CSV attachment"""
+        now = datetime.now()
+        msg = self._new_message(f"Time Tracker Report - {now.strftime('%Y-%m-%d')}")
+
+        # Plain-text fallback, then the HTML report as the preferred alternative
+        msg.set_content(f"Time Tracker report for {now.strftime('%Y-%m-%d')}.\n"
+                        "Open this email in an HTML-capable client to see the breakdown.\n")
+        msg.add_alternative(self.generate_report_html(), subtype='html')
+
+        # Attach CSV
+        csv_data = self.generate_csv_report()
+        if csv_data:
+            msg.add_attachment(csv_data, maintype='text', subtype='csv',
+                               filename=f'time_report_{now.strftime("%Y%m%d")}.csv')
+        return msg
 
+    def send_test_email(self):
+        """Send a test email"""
+        try:
+            self._send_in_background(
+                self._build_test_msg(),
+                lambda: messagebox.showinfo("Success", "Test email sent successfully!"),
+                "Failed to send test email"
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Failed to send test email:\n{str(e)}")
 
     def send_report_now(self):
         """Send report immediately"""
         try:
-            # Generate report
-            report_html = self.generate_report_html()
-
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.config["sender_email"]
-            msg['To'] = self.config["recipient_email"]
-            msg['Subject'] = f"Time Tracker Report - {datetime.now().strftime('%Y-%m-%d')}"
-
-            msg.attach(MIMEText(report_html, 'html'))
-
-            # Attach CSV
-            csv_data = self.generate_csv_report()
-            if csv_data:
-                attachment = MIMEBase('application', 'octet-stream')
-                attachment.set_payload(csv_data)
-                encoders.encode_base64(attachment)
-                attachment.add_header(
-                    'Content-Disposition',
-                    f'attachment; filename=time_report_{datetime.now().strftime("%Y%m%d")}.csv'
-                )
-                msg.attach(attachment)
-
-            # Send
-            server = smtplib.SMTP(self.config["smtp_server"], self.config["smtp_port"])
-            server.starttls()
-            server.login(self.config["sender_email"], self.config["sender_password"])
-            server.send_message(msg)
-            server.quit()
-
-            self.config["last_sent"] = datetime.now().isoformat()
-            self.save_config()
-
-            messagebox.showinfo("Success", "Report sent successfully!")
-
+            self._send_in_background(self._build_report_msg(), self._report_sent, "Failed to send report")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to send report:\n{str(e)}")
 
+    def _report_sent(self):
+        """Record a delivered report (runs on the Tk thread)"""
+        self.config["last_sent"] = datetime.now().isoformat()
+        self.save_config()
+        messagebox.showinfo("Success", "Report sent successfully!")
+
     def generate_report_html(self):
         """Generate HTML report"""
         today = datetime.now().strftime("%Y-%m-%d")
         today_data = self.tracker.data.get(today, {})
 
-        # Calculate totals
-        total_hours = sum(v for k, v in today_data.items()
-                         if k not in ['date', 'session_duration', 'idle_time', 'projects'])
+        # Drop reserved keys and empty categories before sorting
+        items = [(k, hours) for k, v in today_data.items() if k not in RESERVED_KEYS
+                 for hours in (category_hours(v),) if hours > 0]
+        items.sort(key=itemgetter(1), reverse=True)
+        total_hours = math.fsum(hours for _, hours in items)
+        pct_factor = 100.0 / total_hours if total_hours > 0 else 0
 
-        # Build HTML
-        html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                h1 {{ color: #2196F3; }}
-                table {{ border-collapse: collapse; width: 100%; margin-top: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 12px; text-align: left; }}
-                th {{ background-color: #2196F3; color: white; }}
-                tr:nth-child(even) {{ background-color: #f2f2f2; }}
-                .footer {{ margin-top: 30px; color: gray; font-size: 12px; }}
-            </style>
-        </head>
-        <body>
-            <h1>⏱️ Time Tracker Report</h1>
-            <p><strong>Date:</strong> {today}</p>
-            <p><strong>Total Time:</strong> {total_hours:.2f} hours</p>
-
-            <h2>Category Breakdown</h2>
-            <table>
-                <tr>
-                    <th>Category</th>
-                    <th>Hours</th>
-                    <th>Percentage</th>
-                </tr>
-        """
-
-        for category, hours in sorted(today_data.items(), key=lambda x: x[1], reverse=True):
-            if category not in ['date', 'session_duration', 'idle_time', 'projects'] and hours > 0:
-                percentage = (hours / total_hours * 100) if total_hours > 0 else 0
-                html += f"""
-                <tr>
-                    <td>{category}</td>
-                    <td>{hours:.2f}h</td>
-                    <td>{percentage:.1f}%</td>
-                </tr>
-                """
+        rows = [_HTML_ROW.format(category, hours, hours * pct_factor)
+                for category, hours in items]
 
-        html += """
-            </table>
-
-            <div class="footer">
-                <p>Generated by Time Tracker Pro</p>
-            </div>
-        </body>
-        </html>
-        """
-
-        return html
+        return (_HTML_HEAD.format(today=today, total_hours=total_hours)
+                + "".join(rows) + _HTML_TAIL)
 
     def generate_csv_report(self):
         """Generate CSV report data"""
         try:
-            output = []
-            output.append("Date,Category,Hours\n")
-
-            # Get last 7 days
-            for i in range(7):
-                date = (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-                day_data = self.tracker.data.get(date, {})
-
-                for category, hours in day_data.items():
-                    if category not in ['date', 'session_duration', 'idle_time', 'projects'] and hours > 0:
-                        output.append(f"{date},{category},{hours:.2f}\n")
-
-            return "".join(output).encode()
+            today = datetime.now().date()
+            dates = [(today - timedelta(days=i)).isoformat() for i in range(7)]
+            data = self.tracker.data
+
+            rows = (
+                (date, category, f"{hours:.2f}")
+                for date in dates
+                for category, value in data.get(date, {}).items()
+                if category not in RESERVED_KEYS
+                for hours in (category_hours(value),)
+                if hours > 0
+            )
+
+            buf = io.StringIO()
+            writer = csv.writer(buf, lineterminator="\n")
+            writer.writerow(("Date", "Category", "Hours"))
+            writer.writerows(rows)
+            return buf.getvalue().encode()
         except:
             return None
@@ -7,8 +7,80 @@ import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import json
 import csv
+import re
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from operator import itemgetter
+from heapq import nlargest
+from bisect import bisect_left
+from functools import cache
+from types import SimpleNamespace
+
+from ui._day_data import RESERVED_KEYS, category_hours
+
+# Optional fast JSON encoding for the JSON export
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Tracker data also holds non-day keys such as "streaks"
+_is_date_key = re.compile(r'\d{4}-\d{2}-\d{2}').fullmatch
+
+def _first_project(day_data):
+    """First project with time logged for the day, or "" """
+    for proj, proj_hours in day_data.get('projects', {}).items():
+        if proj_hours > 0:
+            return proj
+    return ""
+
+def _json_indented(obj):
+    """obj as 2-space indented JSON bytes, using orjson when available"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+@cache
+def _pdf_styles():
+    """PDF paragraph and table styles, built on the first PDF export (requires reportlab)"""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.platypus import TableStyle
+
+    sheet = getSampleStyleSheet()
+    return SimpleNamespace(
+        sheet=sheet,
+        title=ParagraphStyle(
+            'CustomTitle',
+            parent=sheet['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor("#2196F3"),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        ),
+        summary_table=TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2196F3")),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor("#E3F2FD")),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]),
+        daily_table=TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#E3F2FD")),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+        ]),
+    )
+
+# Filtered range as (date, category, hours, project) rows plus per-category and overall hours
+ExportView = namedtuple("ExportView", "rows totals total_hours")
 
 class ExportFormats:
     """Handle multiple export formats"""
@@ -16,6 +88,8 @@ class ExportFormats:
     def __init__(self, parent, tracker):
         self.parent = parent
         self.tracker = tracker
+        # (key, ExportView) for the last range exported
+        self._view_cache = None
 
     def create_export_ui(self, frame):
         """Create export UI"""
@@ -81,14 +155,15 @@ class ExportFormats:
         btn_frame = ctk.CTkFrame(format_frame, fg_color="transparent")
         btn_frame.pack(fill="x", padx=10, pady=20)
 
+        # Hover colors are darken_color() of each fill, precomputed
         formats = [
-            ("📄 CSV", self.export_csv, "#4CAF50"),
-            ("📋 JSON", self.export_json, "#2196F3"),
-            ("📊 Excel", self.export_excel, "#FF9800"),
-            ("📑 PDF", self.export_pdf, "#F44336")
+            ("📄 CSV", self.export_csv, "#4CAF50", "#3c8c40"),
+            ("📋 JSON", self.export_json, "#2196F3", "#1a78c2"),
+            ("📊 Excel", self.export_excel, "#FF9800", "#cc7900"),
+            ("📑 PDF", self.export_pdf, "#F44336", "#c3352b")
         ]
 
-        for text, command, color in formats:
+        for text, command, color, hover_color in formats:
             ctk.CTkButton(
                 btn_frame,
                 text=text,
@@ -97,7 +172,7 @@ class ExportFormats:
                 width=150,
                 font=ctk.CTkFont(size=16, weight="bold"),
                 fg_color=color,
-                hover_color=self.darken_color(color)
+                hover_color=hover_color
             ).pack(side="left", padx=10, expand=True)
 
         # Info
@@ -122,12 +197,13 @@ class ExportFormats:
     def get_date_range(self):
         """Get selected date range"""
         range_type = self.date_range_var.get()
-        today = datetime.now()
+        # Midnight, so every range starts on a whole day (last N days includes today)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
 
         if range_type == "last_7_days":
-            start_date = today - timedelta(days=7)
+            start_date = today - timedelta(days=6)
         elif range_type == "last_30_days":
-            start_date = today - timedelta(days=30)
+            start_date = today - timedelta(days=29)
         elif range_type == "this_month":
             start_date = today.replace(day=1)
         elif range_type == "last_month":
@@ -138,20 +214,45 @@ class ExportFormats:
 
         return start_date
 
-    def get_filtered_data(self):
-        """Get data for selected date range"""
-        start_date = self.get_date_range()
-        filtered_data = {}
-
-        for date_str, day_data in self.tracker.data.items():
-            try:
-                date = datetime.strptime(date_str, "%Y-%m-%d")
-                if date >= start_date:
-                    filtered_data[date_str] = day_data
-            except:
-                continue
-
-        return filtered_data
+    def _iter_filtered(self, start_str=None):
+        """Yield (date_str, day_data) for tracked days in the selected date range, in date order"""
+        # ISO date keys order like the dates themselves, so a string compare is enough
+        if start_str is None:
+            start_str = self.get_date_range().strftime("%Y-%m-%d")
+
+        # The tracker keeps its date keys sorted, so the range is a bisect and a slice
+        dates = self.tracker.get_sorted_dates()
+        data = self.tracker.data
+        for date_str in dates[bisect_left(dates, start_str):]:
+            if _is_date_key(date_str):
+                yield date_str, data[date_str]
+
+    def _get_view(self):
+        """Export rows and totals for the selected range, reused until the tracked time changes"""
+        start_str = self.get_date_range().strftime("%Y-%m-%d")
+        days = list(self._iter_filtered(start_str))
+
+        # Recording time only ever raises a day's total, so the summed totals spot any change
+        key = (start_str, id(self.tracker.data), len(days),
+               sum(self.tracker.get_day_total(date_str) for date_str, _ in days))
+        if self._view_cache is not None and self._view_cache[0] == key:
+            return self._view_cache[1]
+
+        rows = []
+        totals = defaultdict(float)
+        total_hours = 0
+        for date_str, day_data in days:
+            project = _first_project(day_data)
+            for category, value in day_data.items():
+                if category not in RESERVED_KEYS:
+                    hours = category_hours(value)
+                    totals[category] += hours
+                    total_hours += hours
+                    rows.append((date_str, category, hours, project))
+
+        view = ExportView(rows, dict(totals), total_hours)
+        self._view_cache = (key, view)
+        return view
 
     def export_csv(self):
         """Export to CSV"""
@@ -165,22 +266,14 @@ class ExportFormats:
             if not filename:
                 return
 
-            data = self.get_filtered_data()
-
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
+            with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
                 writer = csv.writer(f)
                 writer.writerow(["Date", "Category", "Hours", "Project"])
 
-                for date_str, day_data in sorted(data.items()):
-                    for category, hours in day_data.items():
-                        if category not in ['date', 'session_duration', 'idle_time', 'projects']:
-                            project = ""
-                            if 'projects' in day_data:
-                                for proj, proj_hours in day_data['projects'].items():
-                                    if proj_hours > 0:
-                                        project = proj
-                                        break
-                            writer.writerow([date_str, category, f"{hours:.2f}", project])
+                writer.writerows(
+                    (date_str, category, format(hours, '.2f'), project)
+                    for date_str, category, hours, project in self._get_view().rows
+                )
 
             messagebox.showinfo("Success", f"Data exported to CSV:\n{filename}")
 
@@ -199,14 +292,20 @@ class ExportFormats:
             if not filename:
                 return
 
-            data = self.get_filtered_data()
-
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "export_date": datetime.now().isoformat(),
-                    "date_range": self.date_range_var.get(),
-                    "data": data
-                }, f, indent=2)
+            # Same layout as json.dump(..., indent=2), written one day at a time
+            with open(filename, 'wb', buffering=1 << 20) as f:
+                f.write(b'{\n  "export_date": %s,\n  "date_range": %s,\n  "data": {' % (
+                    _json_indented(datetime.now().isoformat()), _json_indented(self.date_range_var.get())))
+                sep = b"\n    "
+                empty = True
+                for date_str, day_data in self._iter_filtered():
+                    f.write(sep)
+                    f.write(_json_indented(date_str))
+                    f.write(b": ")
+                    f.write(_json_indented(day_data).replace(b"\n", b"\n    "))
+                    sep = b",\n    "
+                    empty = False
+                f.write(b"}\n}" if empty else b"\n  }\n}")
 
             messagebox.showinfo("Success", f"Data exported to JSON:\n{filename}")
 
@@ -221,6 +320,8 @@ class ExportFormats:
                 from openpyxl import Workbook
                 from openpyxl.chart import PieChart, Reference
                 from openpyxl.styles import Font, Alignment, PatternFill
+                from openpyxl.cell import WriteOnlyCell
+                from openpyxl.utils import get_column_letter
             except ImportError:
                 messagebox.showwarning(
                     "Missing Library",
@@ -240,68 +341,53 @@ class ExportFormats:
             if not filename:
                 return
 
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Time Tracking Data"
-
-            # Headers
-            headers = ["Date", "Category", "Hours", "Project"]
-            ws.append(headers)
+            # Write-only workbook: rows stream to disk instead of staying resident
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet("Time Tracking Data")
 
-            # Style headers
             header_fill = PatternFill(start_color="2196F3", end_color="2196F3", fill_type="solid")
             header_font = Font(bold=True, color="FFFFFF")
 
-            for cell in ws[1]:
+            def header_cell(sheet, value, alignment=None):
+                cell = WriteOnlyCell(sheet, value=value)
                 cell.fill = header_fill
                 cell.font = header_font
-                cell.alignment = Alignment(horizontal="center")
-
-            # Data
-            data = self.get_filtered_data()
-            for date_str, day_data in sorted(data.items()):
-                for category, hours in day_data.items():
-                    if category not in ['date', 'session_duration', 'idle_time', 'projects']:
-                        project = ""
-                        if 'projects' in day_data:
-                            for proj, proj_hours in day_data['projects'].items():
-                                if proj_hours > 0:
-                                    project = proj
-                                    break
-                        ws.append([date_str, category, round(hours, 2), project])
-
-            # Auto-size columns
-            for column in ws.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(cell.value)
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
+                if alignment is not None:
+                    cell.alignment = alignment
+                return cell
+
+            # Data, with column widths tracked while the rows are built
+            headers = ["Date", "Category", "Hours", "Project"]
+            widths = [len(h) for h in headers]
+            rows = []
+            view = self._get_view()
+
+            for date_str, category, hours, project in view.rows:
+                row = [date_str, category, round(hours, 2), project]
+                for i, v in enumerate(row):
+                    width = len(str(v))
+                    if width > widths[i]:
+                        widths[i] = width
+                rows.append(row)
+
+            # Column widths must be set before the first row is written
+            for i, width in enumerate(widths, 1):
+                ws.column_dimensions[get_column_letter(i)].width = min(width + 2, 50)
+
+            center = Alignment(horizontal="center")
+            ws.append([header_cell(ws, h, center) for h in headers])
+            for row in rows:
+                ws.append(row)
 
             # Add summary sheet
             summary = wb.create_sheet("Summary")
-            summary.append(["Category", "Total Hours"])
+            summary.append([header_cell(summary, h) for h in ("Category", "Total Hours")])
 
-            category_totals = defaultdict(float)
-            for date_str, day_data in data.items():
-                for category, hours in day_data.items():
-                    if category not in ['date', 'session_duration', 'idle_time', 'projects']:
-                        category_totals[category] += hours
-
-            for category, total in sorted(category_totals.items(), key=lambda x: x[1], reverse=True):
+            for category, total in sorted(view.totals.items(), key=itemgetter(1), reverse=True):
                 summary.append([category, round(total, 2)])
 
-            # Style summary
-            for cell in summary[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-
-            wb.save(filename)
+            with open(filename, 'wb', buffering=1 << 20) as fh:
+                wb.save(fh)
             messagebox.showinfo("Success", f"Data exported to Excel:\n{filename}")
 
         except Exception as e:
@@ -312,12 +398,9 @@ class ExportFormats:
         try:
             # Check if reportlab is available
             try:
-                from reportlab.lib.pagesizes import letter, A4
-                from reportlab.lib import colors
-                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+                from reportlab.lib.pagesizes import letter
                 from reportlab.lib.units import inch
-                from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-                from reportlab.lib.enums import TA_CENTER, TA_LEFT
+                from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer, PageBreak
             except ImportError:
                 messagebox.showwarning(
                     "Missing Library",
@@ -337,21 +420,12 @@ class ExportFormats:
             if not filename:
                 return
 
-            doc = SimpleDocTemplate(filename, pagesize=letter)
             story = []
-            styles = getSampleStyleSheet()
+            pdf_styles = _pdf_styles()
+            styles = pdf_styles.sheet
 
             # Title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor("#2196F3"),
-                spaceAfter=30,
-                alignment=TA_CENTER
-            )
-
-            story.append(Paragraph("⏱️ Time Tracker Report", title_style))
+            story.append(Paragraph("⏱️ Time Tracker Report", pdf_styles.title))
             story.append(Spacer(1, 0.2 * inch))
 
             # Date info
@@ -361,39 +435,21 @@ class ExportFormats:
             story.append(Spacer(1, 0.3 * inch))
 
             # Summary table
-            data = self.get_filtered_data()
-            category_totals = defaultdict(float)
-            total_hours = 0
-
-            for date_str, day_data in data.items():
-                for category, hours in day_data.items():
-                    if category not in ['date', 'session_duration', 'idle_time', 'projects']:
-                        category_totals[category] += hours
-                        total_hours += hours
+            view = self._get_view()
+            total_hours = view.total_hours
 
             # Category summary
             story.append(Paragraph("Category Summary", styles['Heading2']))
             story.append(Spacer(1, 0.1 * inch))
 
             table_data = [["Category", "Hours", "Percentage"]]
-            for category, hours in sorted(category_totals.items(), key=lambda x: x[1], reverse=True):
+            for category, hours in sorted(view.totals.items(), key=itemgetter(1), reverse=True):
                 percentage = (hours / total_hours * 100) if total_hours > 0 else 0
                 table_data.append([category, f"{hours:.2f}h", f"{percentage:.1f}%"])
 
             table_data.append(["TOTAL", f"{total_hours:.2f}h", "100%"])
 
-            table = Table(table_data, colWidths=[3*inch, 1.5*inch, 1.5*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2196F3")),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor("#E3F2FD")),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
+            table = Table(table_data, colWidths=[3*inch, 1.5*inch, 1.5*inch], style=pdf_styles.summary_table)
 
             story.append(table)
             story.append(PageBreak())
@@ -402,31 +458,32 @@ class ExportFormats:
             story.append(Paragraph("Daily Breakdown", styles['Heading2']))
             story.append(Spacer(1, 0.1 * inch))
 
-            for date_str in sorted(data.keys(), reverse=True)[:30]:  # Last 30 days
-                day_data = data[date_str]
-                daily_total = sum(v for k, v in day_data.items()
-                                if k not in ['date', 'session_duration', 'idle_time', 'projects'])
+            # One style and width list shared by every day's table
+            daily_widths = [4*inch, 2*inch]
+
+            hours_by_day = defaultdict(list)
+            for date_str, category, hours, _ in view.rows:
+                hours_by_day[date_str].append((category, hours))
+
+            for date_str in nlargest(30, hours_by_day):  # Last 30 days
+                day_hours = hours_by_day[date_str]
+                daily_total = sum(hours for _, hours in day_hours)
 
                 if daily_total > 0:
                     story.append(Paragraph(f"<b>{date_str}</b> - {daily_total:.2f}h", styles['Normal']))
 
+                    # Only non-empty categories reach the sort
+                    day_hours = [item for item in day_hours if item[1] > 0]
+                    day_hours.sort(key=itemgetter(1), reverse=True)
                     day_table = [["Category", "Hours"]]
-                    for category, hours in sorted(day_data.items(), key=lambda x: x[1], reverse=True):
-                        if category not in ['date', 'session_duration', 'idle_time', 'projects'] and hours > 0:
-                            day_table.append([category, f"{hours:.2f}h"])
+                    day_table.extend([category, f"{hours:.2f}h"] for category, hours in day_hours)
 
                     if len(day_table) > 1:
-                        dt = Table(day_table, colWidths=[4*inch, 2*inch])
-                        dt.setStyle(TableStyle([
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#E3F2FD")),
-                            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
-                        ]))
-                        story.append(dt)
+                        story.append(Table(day_table, colWidths=daily_widths, style=pdf_styles.daily_table))
                         story.append(Spacer(1, 0.2 * inch))
 
-            doc.build(story)
+            with open(filename, 'wb', buffering=1 << 20) as fh:
+                SimpleDocTemplate(fh, pagesize=letter).build(story)
             messagebox.showinfo("Success", f"Data exported to PDF:\n{filename}")
 
         except Exception as e:
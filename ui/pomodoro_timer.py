@@ -5,25 +5,59 @@ Pomodoro Timer Integration for Time Tracker
 import customtkinter as ctk
 from tkinter import messagebox
 import json
+import logging
 import os
 from datetime import datetime, timedelta
-import threading
 import time
 
+logger = logging.getLogger(__name__)
+
 class PomodoroTimer:
     """Pomodoro technique timer"""
 
+    # CTkFont per (size, weight), shared by every widget that uses it
+    _font_cache = {}
+
+    @classmethod
+    def _font(cls, size, weight="normal"):
+        """Shared CTkFont for size and weight, created on first use"""
+        font = cls._font_cache.get((size, weight))
+        if font is None:
+            font = cls._font_cache[(size, weight)] = ctk.CTkFont(size=size, weight=weight)
+        return font
+
     def __init__(self, parent, tracker):
         self.parent = parent
         self.tracker = tracker
         self.config_file = "pomodoro_config.json"
         self.config = self.load_config()
+        # Append-only log, one {"date", "timestamp", "duration"} object per line
+        self.sessions_file = "pomodoro_sessions.jsonl"
+        self._migrate_sessions("pomodoro_sessions.json")
+        # (date, count) of completed sessions, valid while the log's mtime matches
+        self._sessions_cache = None
+        self._sessions_mtime = 0
 
         self.is_running = False
         self.is_break = False
         self.remaining_seconds = 0
-        self.timer_thread = None
+        # Countdown runs as an after() chain on the Tk thread, against a monotonic deadline
+        self._tick_id = None
+        self._tick_deadline = 0.0
+        self._tick_total = 0
+        self._tick_inv_total = 0.0
+        # Last values written to the display and progress bar, to skip no-op redraws
+        self._last_display_text = None
+        self._last_progress_pct = -1
+        # "MM:SS" text indexed by remaining seconds, grown to cover the longest session started
+        self._mmss = []
+        # Last configure() options applied per widget attribute name, see _apply_ui_state
+        self._ui_cache = {}
         self.session_count = 0
+        # Settings dialog, built on first open and hidden rather than destroyed
+        self._settings_window = None
+        # Frame the tab was last built into; later calls for it only refresh the labels
+        self._built_frame = None
 
     def load_config(self):
         """Load Pomodoro configuration"""
@@ -31,7 +65,8 @@ class PomodoroTimer:
             try:
                 with open(self.config_file, 'r') as f:
                     return json.load(f)
-            except:
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Could not read {self.config_file}, using defaults: {e}")
                 return self.get_default_config()
         return self.get_default_config()
 
@@ -50,14 +85,22 @@ class PomodoroTimer:
 
     def save_config(self):
         """Save configuration"""
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        # Write a sibling and swap it in, so a crash never leaves a truncated config
+        tmp = self.config_file + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.config, f, separators=(",", ":"))
+        os.replace(tmp, self.config_file)
 
     def create_pomodoro_ui(self, frame):
         """Create Pomodoro timer UI"""
+        if frame is self._built_frame and frame.winfo_exists():
+            self._refresh_dynamic()
+            return
+
         # Clear frame
         for widget in frame.winfo_children():
             widget.destroy()
+        self._ui_cache = {}
 
         # Main container
         main_frame = ctk.CTkFrame(frame, fg_color="transparent")
@@ -71,7 +114,7 @@ class PomodoroTimer:
         header = ctk.CTkLabel(
             timer_frame,
             text="🍅 Pomodoro Timer",
-            font=ctk.CTkFont(size=32, weight="bold")
+            font=self._font(32, "bold")
         )
         header.pack(pady=(20, 10))
 
@@ -79,7 +122,7 @@ class PomodoroTimer:
         self.session_label = ctk.CTkLabel(
             timer_frame,
             text=f"Session {self.session_count % self.config['sessions_until_long_break'] + 1}/{self.config['sessions_until_long_break']}",
-            font=ctk.CTkFont(size=16),
+            font=self._font(16),
             text_color="gray"
         )
         self.session_label.pack(pady=5)
@@ -88,7 +131,7 @@ class PomodoroTimer:
         self.timer_display = ctk.CTkLabel(
             timer_frame,
             text="25:00",
-            font=ctk.CTkFont(size=96, weight="bold")
+            font=self._font(96, "bold")
         )
         self.timer_display.pack(pady=30)
 
@@ -96,7 +139,7 @@ class PomodoroTimer:
         self.status_label = ctk.CTkLabel(
             timer_frame,
             text="Ready to start",
-            font=ctk.CTkFont(size=20),
+            font=self._font(20),
             text_color="gray"
         )
         self.status_label.pack(pady=10)
@@ -109,7 +152,9 @@ class PomodoroTimer:
             mode="determinate"
         )
         self.progress_bar.pack(pady=20)
-        self.progress_bar.set(0)
+        self._last_display_text = None
+        self._last_progress_pct = -1
+        self._set_progress(0)
 
         # Control buttons
         button_frame = ctk.CTkFrame(timer_frame, fg_color="transparent")
@@ -121,7 +166,7 @@ class PomodoroTimer:
             command=self.start_timer,
             height=50,
             width=150,
-            font=ctk.CTkFont(size=18, weight="bold"),
+            font=self._font(18, "bold"),
             fg_color="#4CAF50",
             hover_color="#45a049"
         )
@@ -133,7 +178,7 @@ class PomodoroTimer:
             command=self.pause_timer,
             height=50,
             width=150,
-            font=ctk.CTkFont(size=18, weight="bold"),
+            font=self._font(18, "bold"),
             fg_color="#FF9800",
             hover_color="#F57C00",
             state="disabled"
@@ -146,7 +191,7 @@ class PomodoroTimer:
             command=self.reset_timer,
             height=50,
             width=150,
-            font=ctk.CTkFont(size=18, weight="bold"),
+            font=self._font(18, "bold"),
             fg_color="#F44336",
             hover_color="#D32F2F"
         )
@@ -159,7 +204,7 @@ class PomodoroTimer:
         ctk.CTkLabel(
             stats_frame,
             text="Today's Progress",
-            font=ctk.CTkFont(size=18, weight="bold")
+            font=self._font(18, "bold")
         ).pack(pady=(15, 5))
 
         # Daily stats
@@ -167,46 +212,39 @@ class PomodoroTimer:
         daily_frame.pack(fill="x", padx=20, pady=10)
 
         # Completed sessions
-        completed_today = self.get_completed_today()
-        goal = self.config["daily_goal_sessions"]
-
         session_card = ctk.CTkFrame(daily_frame)
         session_card.pack(side="left", expand=True, padx=10, pady=10)
 
         ctk.CTkLabel(
             session_card,
             text="🍅 Sessions",
-            font=ctk.CTkFont(size=14)
+            font=self._font(14)
         ).pack(pady=(10, 5))
 
-        ctk.CTkLabel(
+        self._sessions_label = ctk.CTkLabel(
             session_card,
-            text=f"{completed_today}/{goal}",
-            font=ctk.CTkFont(size=32, weight="bold"),
-            text_color="#4CAF50" if completed_today >= goal else "#2196F3"
-        ).pack(pady=5)
+            text="",
+            font=self._font(32, "bold")
+        )
+        self._sessions_label.pack(pady=5)
 
         # Total time
-        total_minutes = completed_today * self.config["work_duration"]
         time_card = ctk.CTkFrame(daily_frame)
         time_card.pack(side="left", expand=True, padx=10, pady=10)
 
         ctk.CTkLabel(
             time_card,
             text="⏱️ Focus Time",
-            font=ctk.CTkFont(size=14)
+            font=self._font(14)
         ).pack(pady=(10, 5))
 
-        hours = total_minutes // 60
-        minutes = total_minutes % 60
-        time_text = f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m"
-
-        ctk.CTkLabel(
+        self._focus_time_label = ctk.CTkLabel(
             time_card,
-            text=time_text,
-            font=ctk.CTkFont(size=32, weight="bold"),
+            text="",
+            font=self._font(32, "bold"),
             text_color="#FF9800"
-        ).pack(pady=5)
+        )
+        self._focus_time_label.pack(pady=5)
 
         # Settings section
         settings_frame = ctk.CTkFrame(frame)
@@ -217,72 +255,133 @@ class PomodoroTimer:
             text="⚙️ Pomodoro Settings",
             command=self.show_settings,
             height=40,
-            font=ctk.CTkFont(size=14, weight="bold")
+            font=self._font(14, "bold")
         ).pack(pady=15)
 
         # Initialize timer display
         self.remaining_seconds = self.config["work_duration"] * 60
+        self._built_frame = frame
+        self._refresh_dynamic()
+
+    def _refresh_dynamic(self):
+        """Update the labels that change between visits to the tab"""
+        sessions = self.config['sessions_until_long_break']
+        self._apply_ui_state({"session_label": {"text": f"Session {self.session_count % sessions + 1}/{sessions}"}})
+
+        completed_today = self.get_completed_today()
+        goal = self.config["daily_goal_sessions"]
+        self._sessions_label.configure(
+            text=f"{completed_today}/{goal}",
+            text_color="#4CAF50" if completed_today >= goal else "#2196F3"
+        )
+
+        total_minutes = completed_today * self.config["work_duration"]
+        hours = total_minutes // 60
+        minutes = total_minutes % 60
+        self._focus_time_label.configure(text=f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m")
+
         self.update_display()
 
     def start_timer(self):
         """Start the Pomodoro timer"""
         if not self.is_running:
             self.is_running = True
-            self.start_btn.configure(state="disabled")
-            self.pause_btn.configure(state="normal")
-
-            if self.is_break:
-                self.status_label.configure(text="Break Time - Relax!")
-            else:
-                self.status_label.configure(text="Work Session - Stay Focused!")
-
-            self.timer_thread = threading.Thread(target=self.run_timer, daemon=True)
-            self.timer_thread.start()
+            self._apply_ui_state({
+                "start_btn": {"state": "disabled"},
+                "pause_btn": {"state": "normal"},
+                "status_label": {"text": "Break Time - Relax!" if self.is_break else "Work Session - Stay Focused!"},
+            })
+
+            if len(self._mmss) <= self.remaining_seconds:
+                self._mmss = [f"{s // 60:02d}:{s % 60:02d}" for s in range(self.remaining_seconds + 1)]
+
+            self._tick_total = self.remaining_seconds
+            self._tick_inv_total = 1.0 / self._tick_total if self._tick_total else 0.0
+            self._tick_deadline = time.monotonic() + self.remaining_seconds
+            self._tick_id = self.parent.after(1000, self._tick)
+
+    def _cancel_tick(self):
+        """Drop the pending countdown callback, if any"""
+        if self._tick_id is not None:
+            self.parent.after_cancel(self._tick_id)
+            self._tick_id = None
 
     def pause_timer(self):
         """Pause the timer"""
         self.is_running = False
-        self.start_btn.configure(state="normal", text="▶️ Resume")
-        self.pause_btn.configure(state="disabled")
-        self.status_label.configure(text="Paused")
+        self._cancel_tick()
+        self.remaining_seconds = max(0, round(self._tick_deadline - time.monotonic()))
+        self.update_display()
+        self._apply_ui_state({
+            "start_btn": {"state": "normal", "text": "▶️ Resume"},
+            "pause_btn": {"state": "disabled"},
+            "status_label": {"text": "Paused"},
+        })
 
     def reset_timer(self):
         """Reset the timer"""
         self.is_running = False
+        self._cancel_tick()
         self.is_break = False
         self.remaining_seconds = self.config["work_duration"] * 60
-        self.start_btn.configure(state="normal", text="▶️ Start")
-        self.pause_btn.configure(state="disabled")
-        self.status_label.configure(text="Ready to start")
-        self.progress_bar.set(0)
+        self._apply_ui_state({
+            "start_btn": {"state": "normal", "text": "▶️ Start"},
+            "pause_btn": {"state": "disabled"},
+            "status_label": {"text": "Ready to start"},
+        })
+        self._set_progress(0)
         self.update_display()
 
-    def run_timer(self):
-        """Timer countdown loop"""
-        total_seconds = self.remaining_seconds
+    def _tick(self):
+        """One countdown step, run from the Tk event loop"""
+        self._tick_id = None
+        if not self.is_running:
+            return
 
-        while self.is_running and self.remaining_seconds > 0:
-            time.sleep(1)
-            if self.is_running:
-                self.remaining_seconds -= 1
-                self.update_display()
+        # Recomputed from the deadline so late callbacks don't accumulate drift
+        self.remaining_seconds = max(0, round(self._tick_deadline - time.monotonic()))
+        self.update_display()
 
-                # Update progress bar
-                progress = 1 - (self.remaining_seconds / total_seconds)
-                self.progress_bar.set(progress)
+        progress = (self._tick_total - self.remaining_seconds) * self._tick_inv_total
+        self._set_progress(progress)
 
-        if self.remaining_seconds == 0 and self.is_running:
+        if self.remaining_seconds > 0:
+            self._tick_id = self.parent.after(1000, self._tick)
+        else:
             self.timer_complete()
 
     def update_display(self):
         """Update timer display"""
-        minutes = self.remaining_seconds // 60
-        seconds = self.remaining_seconds % 60
-        self.timer_display.configure(text=f"{minutes:02d}:{seconds:02d}")
+        if self.remaining_seconds < len(self._mmss):
+            text = self._mmss[self.remaining_seconds]
+        else:
+            minutes = self.remaining_seconds // 60
+            seconds = self.remaining_seconds % 60
+            text = f"{minutes:02d}:{seconds:02d}"
+        if text != self._last_display_text:
+            self.timer_display.configure(text=text)
+            self._last_display_text = text
+
+    def _apply_ui_state(self, state):
+        """Configure widgets by attribute name, skipping options they already have"""
+        for name, options in state.items():
+            applied = self._ui_cache.setdefault(name, {})
+            changed = {k: v for k, v in options.items() if applied.get(k) != v}
+            if changed:
+                getattr(self, name).configure(**changed)
+                applied.update(changed)
+
+    def _set_progress(self, progress):
+        """Move the progress bar, only redrawing when it crosses a whole percent"""
+        pct = int(progress * 100)
+        if pct != self._last_progress_pct:
+            self.progress_bar.set(progress)
+            self._last_progress_pct = pct
 
     def timer_complete(self):
         """Handle timer completion"""
         self.is_running = False
+        state = {}
 
         if not self.is_break:
             # Work session completed
@@ -310,9 +409,9 @@ class PomodoroTimer:
             if self.config["auto_start_breaks"]:
                 self.start_timer()
             else:
-                self.status_label.configure(text=f"{break_type} Break Ready")
-                self.start_btn.configure(state="normal", text=f"▶️ Start {break_type} Break")
-                self.pause_btn.configure(state="disabled")
+                state["status_label"] = {"text": f"{break_type} Break Ready"}
+                state["start_btn"] = {"state": "normal", "text": f"▶️ Start {break_type} Break"}
+                state["pause_btn"] = {"state": "disabled"}
         else:
             # Break completed
             self.tracker.send_notification(
@@ -326,66 +425,122 @@ class PomodoroTimer:
             if self.config["auto_start_work"]:
                 self.start_timer()
             else:
-                self.status_label.configure(text="Ready to work")
-                self.start_btn.configure(state="normal", text="▶️ Start Work")
-                self.pause_btn.configure(state="disabled")
+                state["status_label"] = {"text": "Ready to work"}
+                state["start_btn"] = {"state": "normal", "text": "▶️ Start Work"}
+                state["pause_btn"] = {"state": "disabled"}
 
         # Update session counter
-        self.session_label.configure(
-            text=f"Session {self.session_count % self.config['sessions_until_long_break'] + 1}/{self.config['sessions_until_long_break']}"
-        )
+        sessions = self.config['sessions_until_long_break']
+        state["session_label"] = {"text": f"Session {self.session_count % sessions + 1}/{sessions}"}
+        self._apply_ui_state(state)
         self.update_display()
-        self.progress_bar.set(0)
+        self._set_progress(0)
+
+    def _migrate_sessions(self, legacy_file):
+        """One-time conversion of the old date -> [sessions] file into the log"""
+        if os.path.exists(self.sessions_file) or not os.path.exists(legacy_file):
+            return
+        try:
+            with open(legacy_file, 'r') as f:
+                sessions = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not migrate {legacy_file}: {e}")
+            return
+
+        tmp = self.sessions_file + ".tmp"
+        with open(tmp, 'w') as f:
+            for day in sorted(sessions):
+                for session in sessions[day]:
+                    f.write(json.dumps({"date": day, **session}, separators=(",", ":")) + "\n")
+        os.replace(tmp, self.sessions_file)
+
+    @staticmethod
+    def _read_lines_backward(f, block_size=4096):
+        """Lines of a binary file from last to first, reading fixed-size blocks from the end"""
+        pos = f.seek(0, os.SEEK_END)
+        partial = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + partial).split(b"\n")
+            partial = lines.pop(0)
+            yield from reversed(lines)
+        yield partial
+
+    def _count_sessions(self, day):
+        """Sessions logged on `day`, stopping at the first earlier entry from the end"""
+        count = 0
+        try:
+            with open(self.sessions_file, 'rb') as f:
+                for line in self._read_lines_backward(f):
+                    if not line.strip():
+                        continue
+                    try:
+                        logged = json.loads(line).get("date", "")
+                    except ValueError:
+                        logger.warning(f"Skipping unreadable line in {self.sessions_file}: {line[:80]!r}")
+                        continue
+                    if logged == day:
+                        count += 1
+                    elif logged < day:
+                        break
+        except OSError as e:
+            logger.warning(f"Could not read {self.sessions_file}: {e}")
+        return count
 
     def save_session(self):
         """Save completed Pomodoro session"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        sessions_file = "pomodoro_sessions.json"
+        now = datetime.now()
+        today = now.strftime("%Y-%m-%d")
 
-        sessions = {}
-        if os.path.exists(sessions_file):
-            try:
-                with open(sessions_file, 'r') as f:
-                    sessions = json.load(f)
-            except:
-                pass
-
-        if today not in sessions:
-            sessions[today] = []
+        with open(self.sessions_file, 'a') as f:
+            f.write(json.dumps({
+                "date": today,
+                "timestamp": now.isoformat(),
+                "duration": self.config["work_duration"]
+            }, separators=(",", ":")) + "\n")
 
-        sessions[today].append({
-            "timestamp": datetime.now().isoformat(),
-            "duration": self.config["work_duration"]
-        })
-
-        with open(sessions_file, 'w') as f:
-            json.dump(sessions, f, indent=2)
+        # Keep the cached count current instead of rescanning the log
+        if self._sessions_cache is not None and self._sessions_cache[0] == today:
+            self._sessions_cache = (today, self._sessions_cache[1] + 1)
+            self._sessions_mtime = os.stat(self.sessions_file).st_mtime
 
     def get_completed_today(self):
         """Get number of completed sessions today"""
         today = datetime.now().strftime("%Y-%m-%d")
-        sessions_file = "pomodoro_sessions.json"
+        try:
+            mtime = os.stat(self.sessions_file).st_mtime
+        except OSError:
+            return 0
 
-        if os.path.exists(sessions_file):
-            try:
-                with open(sessions_file, 'r') as f:
-                    sessions = json.load(f)
-                    return len(sessions.get(today, []))
-            except:
-                pass
-        return 0
+        if self._sessions_cache is None or self._sessions_cache[0] != today or mtime != self._sessions_mtime:
+            self._sessions_cache = (today, self._count_sessions(today))
+            self._sessions_mtime = mtime
+        return self._sessions_cache[1]
 
     def show_settings(self):
         """Show Pomodoro settings dialog"""
+        if self._settings_window is not None and self._settings_window.winfo_exists():
+            self._refresh_settings_fields()
+            self._settings_window.deiconify()
+            self._settings_window.lift()
+            self._settings_window.focus()
+            return
+
         settings_window = ctk.CTkToplevel(self.parent)
         settings_window.title("Pomodoro Settings")
         settings_window.geometry("500x700")
+        settings_window.protocol("WM_DELETE_WINDOW", settings_window.withdraw)
+        self._settings_window = settings_window
+        self.setting_entries = {}
+        self._setting_bounds = {}
 
         # Header
         ctk.CTkLabel(
             settings_window,
             text="⚙️ Pomodoro Settings",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=self._font(24, "bold")
         ).pack(pady=20)
 
         # Scrollable frame
@@ -438,11 +593,19 @@ class PomodoroTimer:
             text="💾 Save Settings",
             command=lambda: self.save_pomodoro_settings(settings_window),
             height=45,
-            font=ctk.CTkFont(size=15, weight="bold"),
+            font=self._font(15, "bold"),
             fg_color="#4CAF50",
             hover_color="#45a049"
         ).pack(pady=20)
 
+    def _refresh_settings_fields(self):
+        """Load the current config into the existing settings widgets"""
+        for key, entry in self.setting_entries.items():
+            entry.delete(0, "end")
+            entry.insert(0, str(self.config[key]))
+        self.auto_start_breaks_var.set(self.config["auto_start_breaks"])
+        self.auto_start_work_var.set(self.config["auto_start_work"])
+
     def create_setting_field(self, parent, label, config_key, min_val, max_val):
         """Create a setting input field"""
         frame = ctk.CTkFrame(parent, fg_color="transparent")
@@ -458,18 +621,27 @@ class PomodoroTimer:
         if not hasattr(self, 'setting_entries'):
             self.setting_entries = {}
         self.setting_entries[config_key] = entry
+        self._setting_bounds[config_key] = (min_val, max_val)
 
     def save_pomodoro_settings(self, window):
         """Save Pomodoro settings"""
         try:
+            updated = dict(self.config)
             for key, entry in self.setting_entries.items():
-                self.config[key] = int(entry.get())
+                min_val, max_val = self._setting_bounds[key]
+                updated[key] = min(max(int(entry.get()), min_val), max_val)
+
+            updated["auto_start_breaks"] = self.auto_start_breaks_var.get()
+            updated["auto_start_work"] = self.auto_start_work_var.get()
 
-            self.config["auto_start_breaks"] = self.auto_start_breaks_var.get()
-            self.config["auto_start_work"] = self.auto_start_work_var.get()
+            # Nothing changed: skip the write, which would also bump the file's mtime
+            if updated == self.config:
+                window.withdraw()
+                return
+            self.config = updated
 
             self.save_config()
-            window.destroy()
+            window.withdraw()
             messagebox.showinfo("Success", "Pomodoro settings saved!")
 
             # Reset timer with new duration
@@ -6,9 +6,31 @@ Allows tagging activities with custom labels for better organization
 import customtkinter as ctk
 from tkinter import messagebox
 import json
+import mmap
 import os
-from datetime import datetime
+import tempfile
+import time
 from collections import defaultdict
+from contextlib import contextmanager
+from functools import cache, partial
+from operator import itemgetter
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Tag files above this size are parsed straight from a memory map when orjson is available
+MMAP_THRESHOLD_BYTES = 1_000_000
+
+# Rows built per page in the tag and analytics lists; the rest wait behind a "Show more" button
+ROWS_PER_PAGE = 50
+
+@cache
+def _font(size, weight="normal"):
+    """Shared CTkFont for size and weight, created on first use"""
+    return ctk.CTkFont(size=size, weight=weight)
 
 class TagsSystem:
     """Manage activity tags"""
@@ -18,21 +40,116 @@ class TagsSystem:
         self.tracker = tracker
         self.tags_file = "activity_tags.json"
         self.tags_data = self.load_tags()
+        # Nesting depth of batched_writes(), and whether a save was deferred inside it
+        self._batch_depth = 0
+        self._dirty = False
+        # Bumped whenever tag statistics may change; refresh_analytics skips panels already showing it
+        self._stats_version = 0
+        self._analytics_rendered = None
+        self._index_tags()
+        self._index_activities()
 
     def load_tags(self):
         """Load tags data"""
-        if os.path.exists(self.tags_file):
-            try:
+        if not os.path.exists(self.tags_file):
+            return {"tags": [], "activity_tags": {}}
+        try:
+            if HAS_ORJSON:
+                with open(self.tags_file, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD_BYTES:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            with memoryview(mm) as view:
+                                data = orjson.loads(view)
+                    else:
+                        data = orjson.loads(f.read())
+            else:
                 with open(self.tags_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {"tags": [], "activity_tags": {}}
-        return {"tags": [], "activity_tags": {}}
+                    data = json.load(f)
+        except:
+            return {"tags": [], "activity_tags": {}}
+
+        # Both keys always exist after load, so the rest of the class indexes them directly.
+        # Each activity's tags are a set in memory and a sorted list on disk
+        data.setdefault("tags", [])
+        data["activity_tags"] = {activity: set(tags) for activity, tags in data.get("activity_tags", {}).items()}
+        return data
+
+    def _index_tags(self):
+        """Rebuild the name -> tag lookups (call after the tags list changes)"""
+        # Reversed so the first tag with a given name wins, like the old linear scan
+        self._tag_by_name = {t['name']: t for t in reversed(self.tags_data["tags"])}
+        # Lowercased names, for the case-insensitive duplicate check
+        self._lc_names = {name.lower() for name in self._tag_by_name}
+        self._invalidate_stats()
+
+    def _index_activities(self):
+        """Build the tag name -> tagged activities index from activity_tags"""
+        # Seeded with every known tag up front, so the pass below only falls back to
+        # the default factory for names tagged on activities but missing from the tags list
+        tag_index = defaultdict(set, {tag_name: set() for tag_name in self._tag_by_name})
+        for activity, tags in self.tags_data["activity_tags"].items():
+            for tag_name in tags:
+                tag_index[tag_name].add(activity)
+        self._tag_index = tag_index
+        self._invalidate_stats()
+
+    def _invalidate_stats(self):
+        """Drop the cached tag statistics and mark rendered analytics as stale"""
+        self._stats_cache = None
+        self._stats_version += 1
+
+    def _tag_stats(self):
+        """Used tags as (-count, name, tag), most used first; cached until tags or tagging change"""
+        if self._stats_cache is None:
+            # Straight from the index; names with no tag left are dropped
+            tag_stats = []
+            for tag_name, activities in self._tag_index.items():
+                tag = self._tag_by_name.get(tag_name)
+                if activities and tag:
+                    tag_stats.append((-len(activities), tag_name, tag))
+            # Ties by name: the index is built from sets, so has no stable order
+            tag_stats.sort(key=itemgetter(0, 1))
+            self._stats_cache = tag_stats
+        return self._stats_cache
 
     def save_tags(self):
-        """Save tags data"""
-        with open(self.tags_file, 'w') as f:
-            json.dump(self.tags_data, f, indent=2)
+        """Save tags data (deferred to the end of the batch inside batched_writes())"""
+        if self._batch_depth:
+            self._dirty = True
+            return
+        self._flush()
+
+    def _flush(self):
+        """Write tags data to disk via a temp file, so a crash never leaves it half-written"""
+        on_disk = dict(self.tags_data, activity_tags={
+            activity: sorted(tags) for activity, tags in self.tags_data["activity_tags"].items()
+        })
+        if HAS_ORJSON:
+            data = orjson.dumps(on_disk)
+        else:
+            data = json.dumps(on_disk, separators=(',', ':')).encode("utf-8")
+        # Uniquely named sibling, so concurrent writers can't clobber each other's temp file
+        f = tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(os.path.abspath(self.tags_file)),
+                                        prefix=".activity_tags.", suffix=".tmp", delete=False)
+        try:
+            with f:
+                f.write(data)
+            os.replace(f.name, self.tags_file)
+        except OSError:
+            os.remove(f.name)
+            raise
+        self._dirty = False
+
+    @contextmanager
+    def batched_writes(self):
+        """Coalesce every save_tags() in the block into one write when it exits"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._dirty:
+                self._flush()
 
     def create_tags_ui(self, frame):
         """Create tags management UI"""
@@ -44,7 +161,7 @@ class TagsSystem:
         header = ctk.CTkLabel(
             frame,
             text="🏷️ Activity Tags",
-            font=ctk.CTkFont(size=32, weight="bold")
+            font=_font(32, "bold")
         )
         header.pack(pady=20)
 
@@ -59,14 +176,14 @@ class TagsSystem:
         ctk.CTkLabel(
             left_panel,
             text="Available Tags",
-            font=ctk.CTkFont(size=20, weight="bold")
+            font=_font(20, "bold")
         ).pack(pady=15)
 
         # Tag list
         tags_scroll = ctk.CTkScrollableFrame(left_panel, height=300)
         tags_scroll.pack(fill="both", expand=True, padx=10, pady=10)
 
-        self.tag_frames = {}
+        self._tags_scroll = tags_scroll
         self.refresh_tag_list(tags_scroll)
 
         # Add new tag
@@ -108,13 +225,14 @@ class TagsSystem:
         ctk.CTkLabel(
             right_panel,
             text="Tag Analytics",
-            font=ctk.CTkFont(size=20, weight="bold")
+            font=_font(20, "bold")
         ).pack(pady=15)
 
         # Analytics scroll
         analytics_scroll = ctk.CTkScrollableFrame(right_panel)
         analytics_scroll.pack(fill="both", expand=True, padx=10, pady=10)
 
+        self._analytics_scroll = analytics_scroll
         self.refresh_analytics(analytics_scroll)
 
         # Bottom panel - Quick tag selector
@@ -124,7 +242,7 @@ class TagsSystem:
         ctk.CTkLabel(
             quick_panel,
             text="Quick Tag Current Activity",
-            font=ctk.CTkFont(size=16, weight="bold")
+            font=_font(16, "bold")
         ).pack(pady=(15, 10))
 
         # Current activity display
@@ -132,7 +250,7 @@ class TagsSystem:
         self.current_activity_label = ctk.CTkLabel(
             quick_panel,
             text=f"Current: {current_app}",
-            font=ctk.CTkFont(size=14),
+            font=_font(14),
             text_color="gray"
         )
         self.current_activity_label.pack(pady=5)
@@ -140,12 +258,19 @@ class TagsSystem:
         # Quick tag buttons
         quick_tags_frame = ctk.CTkFrame(quick_panel, fg_color="transparent")
         quick_tags_frame.pack(fill="x", padx=20, pady=10)
+        self._quick_tags_frame = quick_tags_frame
+        self.refresh_quick_tags()
+
+    def refresh_quick_tags(self):
+        """Rebuild the quick tag buttons"""
+        for widget in self._quick_tags_frame.winfo_children():
+            widget.destroy()
 
-        for tag in self.tags_data.get("tags", [])[:6]:  # Show first 6 tags
+        for tag in self.tags_data["tags"][:6]:  # Show first 6 tags
             tag_btn = ctk.CTkButton(
-                quick_tags_frame,
+                self._quick_tags_frame,
                 text=f"🏷️ {tag['name']}",
-                command=lambda t=tag: self.quick_tag_activity(t),
+                command=partial(self.quick_tag_activity, tag),
                 fg_color=tag.get('color', '#2196F3'),
                 height=35
             )
@@ -156,8 +281,13 @@ class TagsSystem:
         # Clear existing
         for widget in parent.winfo_children():
             widget.destroy()
+        self.tag_frames = {}
+        self._usage_labels = {}
+        # Rows exist for tags[:_tags_shown] only
+        self._tags_shown = 0
+        self._tags_more_btn = None
 
-        tags = self.tags_data.get("tags", [])
+        tags = self.tags_data["tags"]
 
         if not tags:
             ctk.CTkLabel(
@@ -167,62 +297,102 @@ class TagsSystem:
             ).pack(pady=20)
             return
 
-        for tag in tags:
-            tag_frame = ctk.CTkFrame(parent)
-            tag_frame.pack(fill="x", pady=5, padx=5)
+        self.show_more_tags()
+
+    def show_more_tags(self):
+        """Build the next page of tag rows"""
+        tags = self.tags_data["tags"]
+        end = self._tags_shown + ROWS_PER_PAGE
+        if self._tags_more_btn is not None:
+            self._tags_more_btn.destroy()
+            self._tags_more_btn = None
+        for tag in tags[self._tags_shown:end]:
+            self.add_tag_row(self._tags_scroll, tag)
+        self._tags_shown = min(end, len(tags))
+        self._update_tags_more_btn()
+
+    def _update_tags_more_btn(self):
+        """Show, relabel or remove the tag list's "Show more" button"""
+        remaining = len(self.tags_data["tags"]) - self._tags_shown
+        if remaining <= 0:
+            if self._tags_more_btn is not None:
+                self._tags_more_btn.destroy()
+                self._tags_more_btn = None
+        elif self._tags_more_btn is None:
+            self._tags_more_btn = self._more_button(self._tags_scroll, remaining, self.show_more_tags)
+        else:
+            self._tags_more_btn.configure(text=f"Show more ({remaining} left)")
+
+    def _more_button(self, parent, remaining, command):
+        """Pack a "Show more" button at the end of a paged list"""
+        btn = ctk.CTkButton(
+            parent,
+            text=f"Show more ({remaining} left)",
+            command=command,
+            height=30,
+            fg_color="transparent",
+            border_width=1
+        )
+        btn.pack(pady=5)
+        return btn
 
-            # Color indicator
-            color_box = ctk.CTkFrame(
-                tag_frame,
-                width=30,
-                height=30,
-                fg_color=tag.get('color', '#2196F3'),
-                corner_radius=6
-            )
-            color_box.pack(side="left", padx=10, pady=5)
+    def add_tag_row(self, parent, tag):
+        """Append one tag's row to the tag list"""
+        tag_frame = ctk.CTkFrame(parent)
+        tag_frame.pack(fill="x", pady=5, padx=5)
+        self.tag_frames[tag['name']] = tag_frame
 
-            # Tag name
-            ctk.CTkLabel(
-                tag_frame,
-                text=tag['name'],
-                font=ctk.CTkFont(size=14, weight="bold")
-            ).pack(side="left", padx=10)
+        # Color indicator
+        color_box = ctk.CTkFrame(
+            tag_frame,
+            width=30,
+            height=30,
+            fg_color=tag.get('color', '#2196F3'),
+            corner_radius=6
+        )
+        color_box.pack(side="left", padx=10, pady=5)
 
-            # Usage count
-            usage_count = self.get_tag_usage_count(tag['name'])
-            ctk.CTkLabel(
-                tag_frame,
-                text=f"({usage_count} uses)",
-                font=ctk.CTkFont(size=12),
-                text_color="gray"
-            ).pack(side="left", padx=5)
-
-            # Delete button
-            ctk.CTkButton(
-                tag_frame,
-                text="✖",
-                command=lambda t=tag: self.delete_tag(t),
-                width=35,
-                height=35,
-                fg_color="#F44336",
-                hover_color="#D32F2F"
-            ).pack(side="right", padx=5)
+        # Tag name
+        ctk.CTkLabel(
+            tag_frame,
+            text=tag['name'],
+            font=_font(14, "bold")
+        ).pack(side="left", padx=10)
+
+        # Usage count
+        usage_count = self.get_tag_usage_count(tag['name'])
+        usage_label = ctk.CTkLabel(
+            tag_frame,
+            text=f"({usage_count} uses)",
+            font=_font(12),
+            text_color="gray"
+        )
+        usage_label.pack(side="left", padx=5)
+        self._usage_labels[tag['name']] = usage_label
+
+        # Delete button
+        ctk.CTkButton(
+            tag_frame,
+            text="✖",
+            command=partial(self.delete_tag, tag),
+            width=35,
+            height=35,
+            fg_color="#F44336",
+            hover_color="#D32F2F"
+        ).pack(side="right", padx=5)
 
     def refresh_analytics(self, parent):
         """Refresh analytics display"""
+        # This panel already shows the current statistics
+        if self._analytics_rendered == (parent, self._stats_version):
+            return
+        self._analytics_rendered = (parent, self._stats_version)
+
         # Clear existing
         for widget in parent.winfo_children():
             widget.destroy()
 
-        # Calculate tag statistics
-        tag_stats = defaultdict(lambda: {'count': 0, 'total_time': 0})
-
-        for activity, tags in self.tags_data.get("activity_tags", {}).items():
-            for tag_name in tags:
-                tag_stats[tag_name]['count'] += 1
-                # You could add time tracking here if available
-                tag_stats[tag_name]['total_time'] += 1  # Placeholder
-
+        tag_stats = self._tag_stats()
         if not tag_stats:
             ctk.CTkLabel(
                 parent,
@@ -233,11 +403,18 @@ class TagsSystem:
             return
 
         # Display stats
-        for tag_name, stats in sorted(tag_stats.items(), key=lambda x: x[1]['count'], reverse=True):
-            tag = self.get_tag_by_name(tag_name)
-            if not tag:
-                continue
-
+        self._analytics_rows = tag_stats
+        self._analytics_shown = 0
+        self._analytics_more_btn = None
+        self.show_more_analytics(parent)
+
+    def show_more_analytics(self, parent):
+        """Build the next page of analytics rows"""
+        end = self._analytics_shown + ROWS_PER_PAGE
+        if self._analytics_more_btn is not None:
+            self._analytics_more_btn.destroy()
+            self._analytics_more_btn = None
+        for neg_count, tag_name, tag in self._analytics_rows[self._analytics_shown:end]:
             stat_frame = ctk.CTkFrame(parent)
             stat_frame.pack(fill="x", pady=8, padx=5)
 
@@ -258,18 +435,25 @@ class TagsSystem:
             ctk.CTkLabel(
                 info_frame,
                 text=tag_name,
-                font=ctk.CTkFont(size=14, weight="bold"),
+                font=_font(14, "bold"),
                 anchor="w"
             ).pack(anchor="w")
 
             ctk.CTkLabel(
                 info_frame,
-                text=f"{stats['count']} activities tagged",
-                font=ctk.CTkFont(size=11),
+                text=f"{-neg_count} activities tagged",
+                font=_font(11),
                 text_color="gray",
                 anchor="w"
             ).pack(anchor="w")
 
+        self._analytics_shown = min(end, len(self._analytics_rows))
+
+        remaining = len(self._analytics_rows) - self._analytics_shown
+        if remaining > 0:
+            self._analytics_more_btn = self._more_button(parent, remaining,
+                                                         partial(self.show_more_analytics, parent))
+
     def pick_tag_color(self):
         """Pick color for new tag"""
         from tkinter import colorchooser
@@ -287,42 +471,61 @@ class TagsSystem:
             return
 
         # Check if tag exists
-        if any(t['name'].lower() == tag_name.lower() for t in self.tags_data.get("tags", [])):
+        if tag_name.lower() in self._lc_names:
             messagebox.showerror("Error", "Tag already exists")
             return
 
         # Add tag
-        if "tags" not in self.tags_data:
-            self.tags_data["tags"] = []
-
         self.tags_data["tags"].append({
             "name": tag_name,
             "color": self.color_var.get(),
-            "created": datetime.now().isoformat()
+            "created": int(time.time())  # epoch seconds
         })
+        self._index_tags()
 
         self.save_tags()
         self.new_tag_entry.delete(0, 'end')
 
-        # Refresh UI
-        self.create_tags_ui(self.parent)
+        # Refresh UI: add one row rather than rebuilding the tab
+        tags = self.tags_data["tags"]
+        if len(tags) == 1:
+            self.refresh_tag_list(self._tags_scroll)  # replaces the "no tags" placeholder
+        elif self._tags_shown == len(tags) - 1:
+            self.add_tag_row(self._tags_scroll, tags[-1])
+            self._tags_shown += 1
+        else:
+            self._update_tags_more_btn()  # the new row waits behind "Show more"
+        if len(tags) <= 6:
+            self.refresh_quick_tags()
         messagebox.showinfo("Success", f"Tag '{tag_name}' created!")
 
     def delete_tag(self, tag):
         """Delete a tag"""
         if messagebox.askyesno("Confirm Delete", f"Delete tag '{tag['name']}'?"):
             # Remove from tags list
-            self.tags_data["tags"] = [t for t in self.tags_data.get("tags", [])
+            self.tags_data["tags"] = [t for t in self.tags_data["tags"]
                                       if t['name'] != tag['name']]
+            self._index_tags()
 
-            # Remove from all activities
-            activity_tags = self.tags_data.get("activity_tags", {})
-            for activity in activity_tags:
-                if tag['name'] in activity_tags[activity]:
-                    activity_tags[activity].remove(tag['name'])
+            # Remove from the activities that carry it, as listed by the index
+            activity_tags = self.tags_data["activity_tags"]
+            for activity in self._tag_index.pop(tag['name'], ()):
+                activity_tags[activity].discard(tag['name'])
 
             self.save_tags()
-            self.create_tags_ui(self.parent)
+
+            # Refresh UI: drop the one row rather than rebuilding the tab
+            row = self.tag_frames.pop(tag['name'], None)
+            self._usage_labels.pop(tag['name'], None)
+            if not self.tags_data["tags"]:
+                self.refresh_tag_list(self._tags_scroll)
+            else:
+                if row is not None:
+                    row.destroy()
+                    self._tags_shown -= 1
+                self._update_tags_more_btn()
+            self.refresh_quick_tags()
+            self.refresh_analytics(self._analytics_scroll)
 
     def quick_tag_activity(self, tag):
         """Quickly tag the current activity"""
@@ -332,46 +535,37 @@ class TagsSystem:
 
         activity = self.tracker.current_app
 
-        if "activity_tags" not in self.tags_data:
-            self.tags_data["activity_tags"] = {}
-
         if activity not in self.tags_data["activity_tags"]:
-            self.tags_data["activity_tags"][activity] = []
+            self.tags_data["activity_tags"][activity] = set()
 
         if tag['name'] not in self.tags_data["activity_tags"][activity]:
-            self.tags_data["activity_tags"][activity].append(tag['name'])
+            self.tags_data["activity_tags"][activity].add(tag['name'])
+            self._tag_index[tag['name']].add(activity)
+            self._invalidate_stats()
             self.save_tags()
             messagebox.showinfo("Success", f"Tagged '{activity}' with '{tag['name']}'")
-            self.refresh_analytics(self.parent)
+            self.refresh_analytics(self._analytics_scroll)
+            usage_label = self._usage_labels.get(tag['name'])
+            if usage_label is not None:
+                usage_label.configure(text=f"({self.get_tag_usage_count(tag['name'])} uses)")
         else:
             messagebox.showinfo("Already Tagged", f"'{activity}' already has tag '{tag['name']}'")
 
     def get_tag_by_name(self, name):
         """Get tag object by name"""
-        for tag in self.tags_data.get("tags", []):
-            if tag['name'] == name:
-                return tag
-        return None
+        return self._tag_by_name.get(name)
 
     def get_tag_usage_count(self, tag_name):
         """Get usage count for a tag"""
-        count = 0
-        for activity, tags in self.tags_data.get("activity_tags", {}).items():
-            if tag_name in tags:
-                count += 1
-        return count
+        return len(self._tag_index.get(tag_name, ()))
 
     def get_activities_by_tag(self, tag_name):
         """Get all activities with a specific tag"""
-        activities = []
-        for activity, tags in self.tags_data.get("activity_tags", {}).items():
-            if tag_name in tags:
-                activities.append(activity)
-        return activities
+        return sorted(self._tag_index.get(tag_name, ()))
 
     def get_tags_for_activity(self, activity):
         """Get all tags for a specific activity"""
-        return self.tags_data.get("activity_tags", {}).get(activity, [])
+        return sorted(self.tags_data["activity_tags"].get(activity, ()))
 
     def create_tag_filter_view(self, frame):
         """Create a view to filter activities by tag"""
@@ -383,7 +577,7 @@ class TagsSystem:
         ctk.CTkLabel(
             frame,
             text="Filter by Tag",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=_font(24, "bold")
         ).pack(pady=20)
 
         # Tag selector
@@ -393,10 +587,10 @@ class TagsSystem:
         ctk.CTkLabel(
             tag_frame,
             text="Select Tag:",
-            font=ctk.CTkFont(size=14)
+            font=_font(14)
         ).pack(side="left", padx=10)
 
-        tag_names = [t['name'] for t in self.tags_data.get("tags", [])]
+        tag_names = [t['name'] for t in self.tags_data["tags"]]
         if not tag_names:
             tag_names = ["No tags available"]
 
@@ -435,6 +629,8 @@ class TagsSystem:
             ).pack(pady=20)
             return
 
+        # One dict fetched up front; each row is then a single lookup
+        activity_tags = self.tags_data["activity_tags"]
         for activity in activities:
             activity_frame = ctk.CTkFrame(self.results_frame)
             activity_frame.pack(fill="x", pady=5)
@@ -442,16 +638,16 @@ class TagsSystem:
             ctk.CTkLabel(
                 activity_frame,
                 text=activity,
-                font=ctk.CTkFont(size=14)
+                font=_font(14)
             ).pack(side="left", padx=15, pady=10)
 
             # Show all tags for this activity
-            other_tags = [t for t in self.get_tags_for_activity(activity) if t != selected_tag]
+            other_tags = sorted(activity_tags.get(activity, set()) - {selected_tag})
             if other_tags:
                 tags_text = ", ".join(other_tags)
                 ctk.CTkLabel(
                     activity_frame,
                     text=f"Also: {tags_text}",
-                    font=ctk.CTkFont(size=11),
+                    font=_font(11),
                     text_color="gray"
                 ).pack(side="left", padx=5)